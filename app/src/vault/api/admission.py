@@ -0,0 +1,123 @@
+"""Per-collection admission control for API requests."""
+
+import asyncio
+import logging
+from collections.abc import AsyncGenerator, Callable
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, status
+
+from vault.api.auth import CollectionKeyDep
+from vault.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for a free slot before rejecting the request
+ADMISSION_TIMEOUT = 5.0
+
+
+class CollectionAdmission:
+    """
+    Bounds the number of in-flight requests per collection.
+
+    A slow database or MinIO would otherwise let requests for one collection
+    pile up until they exhaust the connection pool. Requests that cannot get a
+    slot within the timeout fail fast with 503 instead of queueing indefinitely.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        timeout: float = ADMISSION_TIMEOUT,
+    ):
+        self.max_concurrent = max_concurrent
+        self.timeout = timeout
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        # collection -> slots currently held (only collections with any)
+        self._in_flight: dict[str, int] = {}
+        self._rejected = 0
+
+    async def acquire(self, collection: str) -> Callable[[], None]:
+        """
+        Wait for a free slot for the collection.
+
+        Args:
+            collection: Collection name
+
+        Returns:
+            Callable releasing the slot; safe to call more than once.
+
+        Raises:
+            HTTPException: 503 if no slot became free within the timeout
+        """
+        semaphore = self._semaphores.get(collection)
+        if semaphore is None:
+            semaphore = self._semaphores[collection] = asyncio.Semaphore(self.max_concurrent)
+
+        try:
+            async with asyncio.timeout(self.timeout):
+                await semaphore.acquire()
+        except TimeoutError:
+            self._rejected += 1
+            logger.warning(f"Admission: collection '{collection}' at capacity, rejecting request")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Too many concurrent requests for collection '{collection}'",
+                headers={"Retry-After": "1"},
+            )
+
+        self._in_flight[collection] = self._in_flight.get(collection, 0) + 1
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                semaphore.release()
+                remaining = self._in_flight[collection] - 1
+                if remaining:
+                    self._in_flight[collection] = remaining
+                else:
+                    del self._in_flight[collection]
+
+        return release
+
+    def get_stats(self) -> dict:
+        """Get admission statistics."""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "timeout_seconds": self.timeout,
+            "in_flight": dict(self._in_flight),
+            "rejected": self._rejected,
+        }
+
+
+# Global admission controller
+_collection_admission = CollectionAdmission(get_settings().api_max_concurrent_per_collection)
+
+
+def get_collection_admission() -> CollectionAdmission:
+    """Get the global collection admission controller."""
+    return _collection_admission
+
+
+async def admit_collection(
+    collection: CollectionKeyDep,
+) -> AsyncGenerator[Callable[[], None], None]:
+    """
+    FastAPI dependency reserving an admission slot for the request's collection.
+
+    Yields the release callable. Streaming endpoints hand it to their response so
+    the slot is held until the body is sent; if the endpoint fails instead, the
+    slot is released here.
+    """
+    release = await _collection_admission.acquire(collection)
+    try:
+        yield release
+    except BaseException:
+        release()
+        raise
+
+
+# Type alias for dependency injection
+AdmissionDep = Annotated[Callable[[], None], Depends(admit_collection)]
@@ -5,6 +5,7 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from vault.api.responses import ORJSONResponse
 from vault.api.routes import router
 from vault.db.session import close_db, get_engine, init_db, reset_engine
 from vault.minio_client.client import ensure_bucket_exists
@@ -23,6 +24,11 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting Vault service...")
 
+    # Let tasks that finish without suspending skip a loop iteration (Python 3.12+)
+    loop = asyncio.get_running_loop()
+    if hasattr(asyncio, "eager_task_factory"):
+        loop.set_task_factory(asyncio.eager_task_factory)
+
     # Initialize database
     await init_db()
     logger.info("Database initialized")
@@ -32,7 +38,6 @@ async def lifespan(app: FastAPI):
     logger.info("MinIO bucket ready")
 
     # Start filesystem watcher
-    loop = asyncio.get_running_loop()
     watcher = get_watcher()
     watcher.start(loop)
 
@@ -53,8 +58,8 @@ async def lifespan(app: FastAPI):
     # Stop background tasks
     await task_manager.stop()
 
-    # Stop watcher
-    watcher.stop()
+    # Stop watcher (its queued objects are registered before the database closes)
+    await watcher.shutdown()
 
     # Close database
     await close_db()
@@ -69,6 +74,7 @@ def create_app() -> FastAPI:
         description="Containerized vault for file storage and hashing for DataSHIELD",
         version="0.1.0",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     # Include routers
@@ -99,19 +105,27 @@ def create_app() -> FastAPI:
         Get database connection pool statistics (admin endpoint).
 
         Returns pool size, checked out connections, overflow status.
-        Note: SQLite uses NullPool so stats will show N/A.
+        Pools without these statistics report N/A.
         """
         engine = get_engine()
         pool = engine.pool
 
-        # NullPool doesn't have these attributes
+        # Not every pool class has these attributes
         try:
             stats = {
                 "pool_class": type(pool).__name__,
-                "pool_size": getattr(pool, "size", lambda: "N/A")() if callable(getattr(pool, "size", None)) else "N/A",
-                "checked_out": getattr(pool, "checkedout", lambda: "N/A")() if callable(getattr(pool, "checkedout", None)) else "N/A",
-                "overflow": getattr(pool, "overflow", lambda: "N/A")() if callable(getattr(pool, "overflow", None)) else "N/A",
-                "checked_in": getattr(pool, "checkedin", lambda: "N/A")() if callable(getattr(pool, "checkedin", None)) else "N/A",
+                "pool_size": getattr(pool, "size", lambda: "N/A")()
+                if callable(getattr(pool, "size", None))
+                else "N/A",
+                "checked_out": getattr(pool, "checkedout", lambda: "N/A")()
+                if callable(getattr(pool, "checkedout", None))
+                else "N/A",
+                "overflow": getattr(pool, "overflow", lambda: "N/A")()
+                if callable(getattr(pool, "overflow", None))
+                else "N/A",
+                "checked_in": getattr(pool, "checkedin", lambda: "N/A")()
+                if callable(getattr(pool, "checkedin", None))
+                else "N/A",
             }
         except Exception as e:
             stats = {
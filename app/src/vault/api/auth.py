@@ -1,17 +1,22 @@
 """Authentication dependencies for the Vault API."""
 
+import asyncio
+import hashlib
+import hmac
 import logging
-import threading
 import time
-from collections import defaultdict
-from dataclasses import dataclass
-from typing import Annotated, Dict
+from collections import OrderedDict
+from collections.abc import Container
+from dataclasses import dataclass, field
+from typing import Annotated
 
 from fastapi import Depends, Header, HTTPException, Path, Request, status
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
-from vault.db.repository import CollectionRepository
-from vault.db.session import get_db_session
+from vault.db.repository import API_KEY_CHANGES, CollectionRepository
+from vault.db.session import DbSessionDep
 from vault.monitoring.metrics import metrics
 
 logger = logging.getLogger(__name__)
@@ -26,30 +31,111 @@ class RateLimitConfig:
     block_seconds: float = 300.0  # Block duration after exceeding limit
 
 
+# Number of lock stripes in the rate limiter (must be a power of two)
+RATE_LIMIT_SHARDS = 64
+
+# Maximum number of keys tracked by the rate limiter across all shards
+RATE_LIMIT_MAX_KEYS = 100_000
+
+
+class BoundedLRU(OrderedDict):
+    """
+    OrderedDict capped at ``max_size`` entries with least-recently-used eviction.
+
+    Not thread-safe; callers hold the owning shard's lock.
+    """
+
+    def __init__(self, max_size: int):
+        super().__init__()
+        self.max_size = max_size
+        self.evicted = 0
+
+    def put(self, key: str, value, pinned: Container[str] = ()) -> None:
+        """
+        Insert or update a key, evicting the oldest entries if over capacity.
+
+        Keys found in ``pinned`` are skipped by eviction and kept.
+        """
+        if key in self:
+            self.move_to_end(key)
+        self[key] = value
+
+        skipped = 0
+        while len(self) > self.max_size and skipped < len(self):
+            oldest = next(iter(self))
+            if oldest in pinned and oldest != key:
+                self.move_to_end(oldest)
+                skipped += 1
+                continue
+            self.popitem(last=False)
+            self.evicted += 1
+
+
+@dataclass
+class _RateLimitShard:
+    """One stripe of rate limiter state, guarded by its own asyncio lock."""
+
+    max_keys: int
+    buckets: BoundedLRU = field(init=False)  # key -> (tokens, last_refill)
+    blocked_until: BoundedLRU = field(init=False)  # key -> unblock_timestamp
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    def __post_init__(self):
+        self.buckets = BoundedLRU(self.max_keys)
+        self.blocked_until = BoundedLRU(self.max_keys)
+
+
 class AuthRateLimiter:
     """
     Rate limiter for authentication failures.
 
-    Tracks failed auth attempts per IP/collection and blocks
-    excessive failures to prevent brute force attacks.
+    Tracks failed auth attempts per IP/collection with a token bucket and
+    blocks excessive failures to prevent brute force attacks.
+
+    Each key holds only ``(tokens, last_refill)``: the bucket starts full at
+    ``max_failures`` tokens, every failure spends one token, and tokens refill
+    at ``max_failures / window_seconds`` per second.
+
+    State is striped over ``RATE_LIMIT_SHARDS`` shards, each with its own lock,
+    so auth attempts for unrelated keys don't contend on a single mutex. Each
+    shard is an LRU capped so that at most ``RATE_LIMIT_MAX_KEYS`` keys are
+    tracked in total; keys that are still blocked are never evicted in favour
+    of merely-failing ones.
+
+    The limiter lives on the event loop: its methods are coroutines guarded by
+    asyncio locks and timestamps come from the loop's monotonic clock, so an
+    auth check never blocks the loop on a thread lock or a wall-clock syscall.
     """
 
     def __init__(self, config: RateLimitConfig | None = None):
         self.config = config or RateLimitConfig()
-        self._failures: Dict[str, list] = defaultdict(list)  # key -> [timestamps]
-        self._blocked_until: Dict[str, float] = {}  # key -> unblock_timestamp
-        self._lock = threading.Lock()
+        max_keys = max(1, RATE_LIMIT_MAX_KEYS // RATE_LIMIT_SHARDS)
+        self._shards = [_RateLimitShard(max_keys) for _ in range(RATE_LIMIT_SHARDS)]
+
+    @property
+    def capacity(self) -> float:
+        """Maximum number of tokens (failures allowed in a burst)."""
+        return float(self.config.max_failures)
+
+    @property
+    def refill_rate(self) -> float:
+        """Tokens regained per second."""
+        return self.config.max_failures / self.config.window_seconds
 
     def _make_key(self, ip: str, collection: str) -> str:
         """Create a unique key for IP + collection."""
         return f"{ip}:{collection}"
 
-    def _cleanup_old_failures(self, key: str) -> None:
-        """Remove failures outside the window."""
-        cutoff = time.time() - self.config.window_seconds
-        self._failures[key] = [t for t in self._failures[key] if t > cutoff]
+    @staticmethod
+    def _now() -> float:
+        """Current time on the running loop's monotonic clock."""
+        return asyncio.get_running_loop().time()
 
-    def is_blocked(self, ip: str, collection: str) -> tuple[bool, float]:
+    def _shard(self, key: str) -> _RateLimitShard:
+        """Get the shard owning a key."""
+        return self._shards[hash(key) & (RATE_LIMIT_SHARDS - 1)]
+
+    async def is_blocked(self, ip: str, collection: str) -> tuple[bool, float]:
         """
         Check if an IP/collection combo is blocked.
 
@@ -57,18 +143,19 @@ class AuthRateLimiter:
             Tuple of (is_blocked, seconds_remaining)
         """
         key = self._make_key(ip, collection)
-        with self._lock:
-            if key in self._blocked_until:
-                remaining = self._blocked_until[key] - time.time()
+        shard = self._shard(key)
+        async with shard.lock:
+            if key in shard.blocked_until:
+                remaining = shard.blocked_until[key] - self._now()
                 if remaining > 0:
                     return True, remaining
                 else:
                     # Block expired
-                    del self._blocked_until[key]
-                    self._failures.pop(key, None)
+                    del shard.blocked_until[key]
+                    shard.buckets.pop(key, None)
             return False, 0
 
-    def record_failure(self, ip: str, collection: str) -> bool:
+    async def record_failure(self, ip: str, collection: str) -> bool:
         """
         Record an auth failure.
 
@@ -76,66 +163,250 @@ class AuthRateLimiter:
             True if the IP/collection is now blocked
         """
         key = self._make_key(ip, collection)
-        now = time.time()
-
-        with self._lock:
-            self._cleanup_old_failures(key)
-            self._failures[key].append(now)
-
-            if len(self._failures[key]) >= self.config.max_failures:
+        shard = self._shard(key)
+        now = self._now()
+        capacity = self.capacity
+
+        async with shard.lock:
+            tokens, last_refill = shard.buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - last_refill) * self.refill_rate)
+            tokens -= 1.0
+            shard.buckets.put(key, (tokens, now), pinned=shard.blocked_until)
+
+            # Less than one token left means max_failures were spent within the window
+            if tokens < 1.0:
                 # Block this IP/collection
-                self._blocked_until[key] = now + self.config.block_seconds
+                shard.blocked_until.put(key, now + self.config.block_seconds)
                 logger.warning(
                     f"Rate limiting: blocking {ip} for collection {collection} "
-                    f"after {len(self._failures[key])} failures"
+                    f"after {self.config.max_failures} failures"
                 )
                 return True
         return False
 
-    def record_success(self, ip: str, collection: str) -> None:
+    async def record_success(self, ip: str, collection: str) -> None:
         """Clear failures on successful auth."""
         key = self._make_key(ip, collection)
-        with self._lock:
-            self._failures.pop(key, None)
-            self._blocked_until.pop(key, None)
+        shard = self._shard(key)
+        async with shard.lock:
+            shard.buckets.pop(key, None)
+            shard.blocked_until.pop(key, None)
+
+    async def purge_expired(self) -> int:
+        """
+        Drop state that no longer affects decisions.
+
+        Removes expired blocks (with their buckets, as ``is_blocked`` does) and
+        buckets that have refilled to capacity, which behave like absent keys.
+        Each shard lock is held only while that shard is swept.
+
+        Returns:
+            Number of keys removed
+        """
+        capacity = self.capacity
+        refill_rate = self.refill_rate
+        removed = 0
+        for shard in self._shards:
+            async with shard.lock:
+                now = self._now()
+                expired = [k for k, until in shard.blocked_until.items() if until <= now]
+                for key in expired:
+                    del shard.blocked_until[key]
+                    shard.buckets.pop(key, None)
+                refilled = [
+                    k
+                    for k, (tokens, last_refill) in shard.buckets.items()
+                    if k not in shard.blocked_until
+                    and tokens + (now - last_refill) * refill_rate >= capacity
+                ]
+                for key in refilled:
+                    del shard.buckets[key]
+                removed += len(expired) + len(refilled)
+        return removed
 
     def get_stats(self) -> dict:
-        """Get rate limiter statistics."""
-        with self._lock:
-            active_blocks = sum(
-                1 for t in self._blocked_until.values() if t > time.time()
-            )
-            return {
-                "tracked_keys": len(self._failures),
-                "active_blocks": active_blocks,
-                "config": {
-                    "max_failures": self.config.max_failures,
-                    "window_seconds": self.config.window_seconds,
-                    "block_seconds": self.config.block_seconds,
-                },
-            }
+        """
+        Get rate limiter statistics.
+
+        Reads only container sizes and counters, so it takes no shard lock and
+        costs O(shards) regardless of how many keys are tracked. Blocks that
+        expired but were not looked up since still count as active.
+        """
+        tracked_keys = 0
+        active_blocks = 0
+        evicted_keys = 0
+        for shard in self._shards:
+            tracked_keys += len(shard.buckets)
+            active_blocks += len(shard.blocked_until)
+            evicted_keys += shard.buckets.evicted + shard.blocked_until.evicted
+        return {
+            "tracked_keys": tracked_keys,
+            "active_blocks": active_blocks,
+            "evicted_keys": evicted_keys,
+            "config": {
+                "max_failures": self.config.max_failures,
+                "window_seconds": self.config.window_seconds,
+                "block_seconds": self.config.block_seconds,
+                "max_keys": RATE_LIMIT_MAX_KEYS,
+            },
+        }
+
+
+class VerifiedKeyCache:
+    """
+    TTL'd LRU cache of collection keys that recently passed verification.
+
+    Maps each collection to the SHA-256 digest of its last verified key, so raw
+    keys are never kept in memory and a lookup is one dict access plus a
+    constant-time digest comparison. Only successful verifications are cached;
+    failures always go to the database so the rate limiter sees every one of them.
+
+    Each invalidation bumps the collection's generation. A verification takes
+    the generation before querying and only caches its result if it is
+    unchanged, so a check that read the old key cannot re-cache it after a
+    rotation.
+
+    The cache is only touched from the event loop and its methods never
+    await, so it needs no lock.
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl_seconds: float = 300.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        # collection -> (digest, expiry)
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        # collection -> invalidation count (only collections invalidated at least once)
+        self._generations: dict[str, int] = {}
+
+    @staticmethod
+    def key_digest(api_key: str) -> bytes:
+        """SHA-256 digest of an API key."""
+        return hashlib.sha256(api_key.encode()).digest()
+
+    def contains(self, collection: str, key_digest: bytes) -> bool:
+        """Check whether a key digest is cached for a collection and not expired."""
+        entry = self._entries.get(collection)
+        if entry is None:
+            return False
+        if entry[1] <= time.monotonic():
+            del self._entries[collection]
+            return False
+        if not hmac.compare_digest(entry[0], key_digest):
+            return False
+        self._entries.move_to_end(collection)
+        return True
+
+    def generation(self, collection: str) -> int:
+        """Current generation of a collection, to be passed to add()."""
+        return self._generations.get(collection, 0)
+
+    def add(self, collection: str, key_digest: bytes, generation: int) -> None:
+        """Cache a successful verification, unless invalidated since it started."""
+        if self._generations.get(collection, 0) != generation:
+            return
+        self._entries[collection] = (key_digest, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(collection)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, collection: str) -> None:
+        """Drop the cached key of a collection (e.g. after key rotation)."""
+        self._generations[collection] = self._generations.get(collection, 0) + 1
+        self._entries.pop(collection, None)
+
+    def get_stats(self) -> dict:
+        """Get cache statistics."""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+        }
 
 
 # Global rate limiter instance
 _auth_rate_limiter = AuthRateLimiter()
 
+# Global verified key cache
+_verified_key_cache = VerifiedKeyCache()
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_keys(session: Session) -> None:
+    """Drop cached verifications of collections whose keys changed in the commit."""
+    for collection in session.info.pop(API_KEY_CHANGES, ()):
+        _verified_key_cache.invalidate(collection)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_key_changes(session: Session) -> None:
+    """Forget key changes that were rolled back; the cache stays valid."""
+    session.info.pop(API_KEY_CHANGES, None)
+
+
+# In-flight key verifications: (collection, key digest) -> future with the result
+_inflight_verifications: dict[tuple[str, bytes], asyncio.Future] = {}
+
 
 def get_client_ip(request: Request) -> str:
     """Extract client IP from request, handling proxies."""
     # Check X-Forwarded-For for clients behind proxies
     forwarded = request.headers.get("X-Forwarded-For")
     if forwarded:
-        # Take the first IP (original client)
-        return forwarded.split(",")[0].strip()
+        # Take the first IP (original client) without splitting the whole header
+        comma = forwarded.find(",")
+        return (forwarded[:comma] if comma >= 0 else forwarded).strip()
     # Fall back to direct client
-    return request.client.host if request.client else "unknown"
+    client = request.client
+    return client.host if client else "unknown"
+
+
+async def _verify_api_key_once(
+    session: AsyncSession, collection: str, api_key: str, key_digest: bytes
+) -> bool:
+    """
+    Verify an API key against the database, coalescing concurrent checks.
+
+    The first request for a (collection, key) pair queries the database; requests
+    arriving while it runs await the same result instead of issuing their own
+    query. Registration happens without awaiting, so no lock is needed.
+
+    If the leading request is cancelled (e.g. its client disconnected), waiters
+    that are not being cancelled themselves retry and run their own query.
+    """
+    inflight_key = (collection, key_digest)
+    while (inflight := _inflight_verifications.get(inflight_key)) is not None:
+        try:
+            return await asyncio.shield(inflight)
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                raise
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight_verifications[inflight_key] = future
+    generation = _verified_key_cache.generation(collection)
+    try:
+        repo = CollectionRepository(session)
+        valid = await repo.verify_api_key(collection, api_key)
+        if valid:
+            _verified_key_cache.add(collection, key_digest, generation)
+        future.set_result(valid)
+        return valid
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as e:
+        future.set_exception(e)
+        future.exception()  # Mark retrieved when no request is waiting on it
+        raise
+    finally:
+        _inflight_verifications.pop(inflight_key, None)
 
 
 async def verify_collection_key(
     request: Request,
     collection: Annotated[str, Path(description="Collection name")],
     x_collection_key: Annotated[str, Header()],
-    session: AsyncSession = Depends(get_db_session),
+    session: DbSessionDep,
 ) -> str:
     """
     Verify access to a collection via collection key.
@@ -148,7 +419,7 @@ async def verify_collection_key(
     client_ip = get_client_ip(request)
 
     # Check if rate limited
-    is_blocked, remaining = _auth_rate_limiter.is_blocked(client_ip, collection)
+    is_blocked, remaining = await _auth_rate_limiter.is_blocked(client_ip, collection)
     if is_blocked:
         metrics.api_rate_limit_hits.inc()
         raise HTTPException(
@@ -157,14 +428,19 @@ async def verify_collection_key(
             headers={"Retry-After": str(int(remaining))},
         )
 
-    repo = CollectionRepository(session)
-    if await repo.verify_api_key(collection, x_collection_key):
-        _auth_rate_limiter.record_success(client_ip, collection)
+    # Skip the database for keys verified within the cache TTL
+    key_digest = VerifiedKeyCache.key_digest(x_collection_key)
+    if _verified_key_cache.contains(collection, key_digest):
+        await _auth_rate_limiter.record_success(client_ip, collection)
+        return collection
+
+    if await _verify_api_key_once(session, collection, x_collection_key, key_digest):
+        await _auth_rate_limiter.record_success(client_ip, collection)
         return collection
 
     # Record failure and check if now blocked
     metrics.api_auth_failures.inc()
-    was_blocked = _auth_rate_limiter.record_failure(client_ip, collection)
+    was_blocked = await _auth_rate_limiter.record_failure(client_ip, collection)
 
     if was_blocked:
         raise HTTPException(
@@ -186,3 +462,8 @@ CollectionKeyDep = Annotated[str, Depends(verify_collection_key)]
 def get_auth_rate_limiter() -> AuthRateLimiter:
     """Get the global auth rate limiter for monitoring."""
     return _auth_rate_limiter
+
+
+def get_verified_key_cache() -> VerifiedKeyCache:
+    """Get the global verified key cache."""
+    return _verified_key_cache
@@ -1,23 +1,25 @@
 """API routes for the Vault service."""
 
+import asyncio
 import logging
-from typing import Annotated, Optional
+from collections.abc import AsyncGenerator, Callable
+from typing import Annotated, Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
-from fastapi.responses import StreamingResponse
-from sqlalchemy.ext.asyncio import AsyncSession
+import orjson
+from fastapi import APIRouter, HTTPException, Path, Query, status
 
+from vault.api.admission import AdmissionDep
 from vault.api.auth import CollectionKeyDep
+from vault.api.responses import AdmittedStreamingResponse, ORJSONResponse
 from vault.api.schemas import (
     HashListResponse,
-    ObjectHash,
     ObjectListResponse,
     SingleHashResponse,
 )
 from vault.db.repository import ObjectRepository
-from vault.db.session import get_db_session
+from vault.db.session import DbSessionDep, get_session
 from vault.minio_client.client import get_object_stream, object_exists
-from vault.sync.state import wait_for_sync
+from vault.sync.state import sync_state_snapshot, wait_for_sync
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +29,36 @@ router = APIRouter(prefix="/api/v1", tags=["collections"])
 DEFAULT_SYNC_TIMEOUT = 30.0
 
 
+async def _stream_listing(
+    collection: str, field: str, encode_row: Callable[[tuple[str, str]], Any]
+) -> AsyncGenerator[bytes, None]:
+    """
+    Stream a collection listing as JSON, one database batch at a time.
+
+    Produces {"collection": ..., <field>: [...]} without materializing the full
+    result. The request's session (DbSessionDep) is closed once the endpoint
+    returns, so this is the only connection held while the body streams.
+
+    A database error mid-stream is logged and re-raised without closing the
+    envelope: the server then drops the connection instead of ending the
+    chunked body, so clients see a failed transfer rather than a valid-looking
+    partial listing.
+    """
+    yield b'{"collection":' + orjson.dumps(collection) + b',"' + field.encode() + b'":['
+    first = True
+    try:
+        async with get_session() as session:
+            repo = ObjectRepository(session)
+            async for rows in repo.iter_ready_name_hash(collection):
+                chunk = b",".join(orjson.dumps(encode_row(row)) for row in rows)
+                yield chunk if first else b"," + chunk
+                first = False
+    except Exception as e:
+        logger.error(f"Listing of collection '{collection}' aborted mid-stream: {e}")
+        raise
+    yield b"]}"
+
+
 @router.get(
     "/collections/{collection}/objects",
     response_model=ObjectListResponse,
@@ -34,7 +66,8 @@ DEFAULT_SYNC_TIMEOUT = 30.0
 )
 async def list_objects(
     collection: CollectionKeyDep,
-    session: AsyncSession = Depends(get_db_session),
+    release_slot: AdmissionDep,
+    session: DbSessionDep,
     sync_timeout: Annotated[
         Optional[float],
         Query(
@@ -54,20 +87,19 @@ async def list_objects(
     Requires X-Collection-Key header.
     """
     # Wait for sync if timeout > 0 - REUSE SESSION to avoid connection pool exhaustion
-    if sync_timeout and sync_timeout > 0:
+    # Skip the wait entirely when nothing changed since the collection was last synced
+    if sync_timeout and sync_timeout > 0 and sync_state_snapshot(collection) is None:
         sync_state = await wait_for_sync(collection, timeout=sync_timeout, session=session)
         if not sync_state.is_synced:
             logger.warning(
                 f"list_objects: collection '{collection}' not fully synced after {sync_timeout}s "
-                f"({sync_state.files_processing} processing, {len(sync_state.pending_files)} pending)"
+                f"({sync_state.files_processing} processing, {sync_state.pending_count} pending)"
             )
 
-    repo = ObjectRepository(session)
-    objects = await repo.list_ready_by_collection(collection)
-
-    return ObjectListResponse(
-        collection=collection,
-        objects=[obj.name for obj in objects],
+    return AdmittedStreamingResponse(
+        _stream_listing(collection, "objects", lambda row: row[0]),
+        release_slot,
+        media_type="application/json",
     )
 
 
@@ -78,7 +110,8 @@ async def list_objects(
 )
 async def list_hashes(
     collection: CollectionKeyDep,
-    session: AsyncSession = Depends(get_db_session),
+    release_slot: AdmissionDep,
+    session: DbSessionDep,
     sync_timeout: Annotated[
         Optional[float],
         Query(
@@ -98,20 +131,19 @@ async def list_hashes(
     Requires X-Collection-Key header.
     """
     # Wait for sync if timeout > 0 - REUSE SESSION to avoid connection pool exhaustion
-    if sync_timeout and sync_timeout > 0:
+    # Skip the wait entirely when nothing changed since the collection was last synced
+    if sync_timeout and sync_timeout > 0 and sync_state_snapshot(collection) is None:
         sync_state = await wait_for_sync(collection, timeout=sync_timeout, session=session)
         if not sync_state.is_synced:
             logger.warning(
                 f"list_hashes: collection '{collection}' not fully synced after {sync_timeout}s "
-                f"({sync_state.files_processing} processing, {len(sync_state.pending_files)} pending)"
+                f"({sync_state.files_processing} processing, {sync_state.pending_count} pending)"
             )
 
-    repo = ObjectRepository(session)
-    objects = await repo.list_ready_by_collection(collection)
-
-    return HashListResponse(
-        collection=collection,
-        items=[ObjectHash(name=obj.name, hash_sha256=obj.hash_sha256) for obj in objects],
+    return AdmittedStreamingResponse(
+        _stream_listing(collection, "items", lambda row: {"name": row[0], "hash_sha256": row[1]}),
+        release_slot,
+        media_type="application/json",
     )
 
 
@@ -129,7 +161,8 @@ async def list_hashes(
 async def download_object(
     collection: CollectionKeyDep,
     name: Annotated[str, Path(description="Object name")],
-    session: AsyncSession = Depends(get_db_session),
+    release_slot: AdmissionDep,
+    session: DbSessionDep,
 ):
     """
     Download an object from the collection.
@@ -140,7 +173,7 @@ async def download_object(
     Note: This endpoint does NOT wait for sync since it targets a specific object.
     """
     repo = ObjectRepository(session)
-    obj = await repo.get_ready_by_collection_and_name(collection, name)
+    obj = await repo.get_ready_ref_by_collection_and_name(collection, name)
 
     if obj is None:
         raise HTTPException(
@@ -149,14 +182,15 @@ async def download_object(
         )
 
     # Verify object exists in MinIO
-    if not object_exists(obj.object_key):
+    if not await asyncio.to_thread(object_exists, obj.object_key):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Object '{name}' not found in storage",
         )
 
-    return StreamingResponse(
+    return AdmittedStreamingResponse(
         get_object_stream(obj.object_key),
+        release_slot,
         media_type="application/octet-stream",
         headers={
             "Content-Disposition": f'attachment; filename="{name}"',
@@ -174,7 +208,7 @@ async def download_object(
 async def get_object_hash(
     collection: CollectionKeyDep,
     name: Annotated[str, Path(description="Object name")],
-    session: AsyncSession = Depends(get_db_session),
+    session: DbSessionDep,
 ):
     """
     Get the SHA-256 hash of a specific object.
@@ -184,7 +218,7 @@ async def get_object_hash(
     Note: This endpoint does NOT wait for sync since it targets a specific object.
     """
     repo = ObjectRepository(session)
-    obj = await repo.get_ready_by_collection_and_name(collection, name)
+    obj = await repo.get_ready_ref_by_collection_and_name(collection, name)
 
     if obj is None:
         raise HTTPException(
@@ -192,8 +226,6 @@ async def get_object_hash(
             detail=f"Object '{name}' not found in collection '{collection}'",
         )
 
-    return SingleHashResponse(
-        collection=collection,
-        name=name,
-        hash_sha256=obj.hash_sha256,
-    )
+    # Returning the response directly skips response_model validation and
+    # jsonable_encoder; the model still documents the shape in OpenAPI
+    return ORJSONResponse({"collection": collection, "name": name, "hash_sha256": obj.hash_sha256})
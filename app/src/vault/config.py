@@ -1,18 +1,23 @@
 """Configuration settings for the Vault service."""
 
-from functools import lru_cache
+from functools import cached_property
 from pathlib import Path
+from typing import Literal
 
+from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
-    model_config = SettingsConfigDict(env_prefix="VAULT_", extra="ignore")
+    model_config = SettingsConfigDict(env_prefix="VAULT_", extra="ignore", frozen=True)
 
     # Database configuration
     database_url: str = "sqlite+aiosqlite:///data/vault.db"
+    # Larger page cache, in-memory temp storage and memory-mapped I/O for SQLite
+    # (mmap_size is a no-op where the OS or SQLite build lacks mmap support)
+    sqlite_performance_pragmas: bool = True
 
     # MinIO configuration
     minio_endpoint: str = "minio:9000"
@@ -20,17 +25,58 @@ class Settings(BaseSettings):
     minio_secret_key: str = "minioadmin"
     minio_bucket: str = "vault"
     minio_secure: bool = False
+    # Seconds a successful MinIO health probe is reused (until a MinIO call fails)
+    minio_health_ttl: float = 15.0
+    # Max pooled HTTP connections to MinIO (concurrent downloads each hold one)
+    minio_pool_maxsize: int = 64
+    # Multipart parts uploaded concurrently per file (memory use: this many parts)
+    minio_upload_concurrency: int = 4
+    # Bytes per read when streaming downloads; each in-flight download buffers
+    # one block, so larger blocks trade memory for fewer thread hand-offs
+    minio_download_chunk_size: int = 1024 * 1024
+    # Upload with sendfile(2) through presigned URLs (plain HTTP endpoints only)
+    minio_sendfile_uploads: bool = False
+
+    # Files from 64 MiB up to this size are memory-mapped for hashing; larger
+    # ones are streamed through a fixed buffer instead of mapping them whole
+    hash_mmap_max_bytes: int = 1024 * 1024 * 1024
 
     # Collections root directory
     collections_root: Path = Path("/data/collections")
+    # Filesystem watcher backend: "polling" (works on any mount, including
+    # Docker volumes where host changes raise no inotify events), "native"
+    # (inotify and friends) or "auto" (native if a self-test sees an event)
+    watcher_backend: Literal["polling", "native", "auto"] = "polling"
+    # Threads running the watcher's hash/upload and delete calls, kept apart
+    # from the default executor used by API requests
+    watcher_io_workers: int = 3
+    # Files the startup scan processes concurrently. The watcher's processing
+    # semaphore (3) still bounds hash/upload work; a few extra keep it busy.
+    watcher_scan_concurrency: int = 4
 
     # API configuration
     api_host: str = "0.0.0.0"
     api_port: int = 8000
+    # Uvicorn worker processes. Each worker would run its own watcher, background
+    # sync and startup index DDL on the same collections, so only 1 is supported
+    api_workers: int = 1
+    # Requests served concurrently per collection; the database pool is sized
+    # to fit this many streamed listings holding a connection each
+    api_max_concurrent_per_collection: int = 32
+
+    @field_validator("api_workers")
+    @classmethod
+    def _single_api_worker(cls, value: int) -> int:
+        if value != 1:
+            raise ValueError(
+                "only 1 API worker is supported: every worker would start its own "
+                "filesystem watcher and background sync"
+            )
+        return value
 
-    @property
+    @cached_property
     def sync_database_url(self) -> str:
-        """Return synchronous database URL for Alembic migrations."""
+        """Return synchronous database URL for Alembic migrations (computed once)."""
         if self.database_url.startswith("sqlite+aiosqlite"):
             return self.database_url.replace("sqlite+aiosqlite", "sqlite")
         if self.database_url.startswith("postgresql+asyncpg"):
@@ -38,7 +84,10 @@ class Settings(BaseSettings):
         return self.database_url
 
 
-@lru_cache
+# Settings are read from the environment once, at import time
+SETTINGS: Settings = Settings()
+
+
 def get_settings() -> Settings:
-    """Get cached settings instance."""
-    return Settings()
+    """Get the settings instance."""
+    return SETTINGS
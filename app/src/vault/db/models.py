@@ -37,6 +37,11 @@ class Collection(Base):
         "Object", back_populates="collection_rel", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        # Lets API key verification be answered from the index alone
+        Index("ix_collection_auth", "name", "api_key_hash"),
+    )
+
     def __repr__(self) -> str:
         return f"<Collection(name={self.name!r}, is_active={self.is_active})>"
 
@@ -67,8 +72,17 @@ class Object(Base):
     collection_rel: Mapped["Collection"] = relationship("Collection", back_populates="objects")
 
     __table_args__ = (
-        Index("ix_objects_collection_name_status", "collection", "name", "status"),
-        Index("ix_objects_collection_status", "collection", "status"),
+        # Single-object lookups; on PostgreSQL the included columns make them index-only
+        Index(
+            "ix_objects_lookup",
+            "collection",
+            "name",
+            "status",
+            postgresql_include=["object_key", "hash_sha256", "size_bytes"],
+        ),
+        # Covers the list queries (filter, order and projected columns) so they
+        # can be answered from the index alone
+        Index("ix_objects_cover", "collection", "status", "name", "hash_sha256"),
     )
 
     def __repr__(self) -> str:
@@ -2,19 +2,76 @@
 
 import hashlib
 import secrets
-from datetime import datetime, timezone
+from collections.abc import AsyncGenerator
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import Row, bindparam, delete, func, literal, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from vault.db.models import Collection, Object, ObjectStatus
 
+# Rows per multi-row INSERT in bulk upserts (keeps SQLite under its bound-parameter limit)
+BULK_UPSERT_BATCH_SIZE = 500
+
+# Hot read queries are built once at import time, so each call skips statement
+# construction and hits SQLAlchemy's compiled cache directly
+_GET_COLLECTION_STMT = select(Collection).where(Collection.name == bindparam("name"))
+_GET_ACTIVE_COLLECTION_STMT = select(Collection).where(
+    Collection.name == bindparam("name"), Collection.is_active == True
+)
+_LIST_COLLECTIONS_STMT = select(Collection).order_by(Collection.name)
+_LIST_ACTIVE_COLLECTIONS_STMT = (
+    select(Collection).where(Collection.is_active == True).order_by(Collection.name)
+)
+_VERIFY_API_KEY_STMT = (
+    select(literal(1))
+    .where(
+        Collection.name == bindparam("name"),
+        Collection.is_active == True,
+        Collection.api_key_hash == bindparam("api_key_hash"),
+    )
+    .limit(1)
+)
+_GET_READY_BY_NAME_STMT = select(Object).where(
+    Object.collection == bindparam("collection"),
+    Object.name == bindparam("name"),
+    Object.status == ObjectStatus.READY,
+)
+_GET_READY_REF_STMT = select(Object.object_key, Object.hash_sha256, Object.size_bytes).where(
+    Object.collection == bindparam("collection"),
+    Object.name == bindparam("name"),
+    Object.status == ObjectStatus.READY,
+)
+_LIST_READY_STMT = (
+    select(Object)
+    .where(Object.collection == bindparam("collection"), Object.status == ObjectStatus.READY)
+    .order_by(Object.name)
+)
+_LIST_READY_NAMES_STMT = select(Object.name).where(
+    Object.collection == bindparam("collection"), Object.status == ObjectStatus.READY
+)
+_LIST_ALL_READY_NAME_KEY_STMT = (
+    select(Object.collection, Object.name, Object.object_key)
+    .where(Object.status == ObjectStatus.READY)
+    .order_by(Object.collection, Object.name)
+)
+_LIST_READY_NAME_HASH_STMT = (
+    select(Object.name, Object.hash_sha256)
+    .where(Object.collection == bindparam("collection"), Object.status == ObjectStatus.READY)
+    .order_by(Object.name)
+)
+
 
 def hash_api_key(api_key: str) -> str:
     """Hash an API key using SHA-256."""
     return hashlib.sha256(api_key.encode()).hexdigest()
 
 
+# Session.info key collecting collections whose key or active state changed in
+# the session's transaction; committed changes invalidate cached verifications
+API_KEY_CHANGES = "vault_api_key_changes"
+
+
 def generate_api_key() -> str:
     """Generate a random API key."""
     return secrets.token_hex(32)
@@ -26,32 +83,28 @@ class CollectionRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    def _record_api_key_change(self, name: str) -> None:
+        """Note that a collection's accepted keys change when this transaction commits."""
+        self.session.info.setdefault(API_KEY_CHANGES, set()).add(name)
+
     async def get_by_name(self, name: str) -> Collection | None:
         """Get a collection by name."""
-        result = await self.session.execute(
-            select(Collection).where(Collection.name == name)
-        )
+        result = await self.session.execute(_GET_COLLECTION_STMT, {"name": name})
         return result.scalar_one_or_none()
 
     async def get_active_by_name(self, name: str) -> Collection | None:
         """Get an active collection by name."""
-        result = await self.session.execute(
-            select(Collection).where(Collection.name == name, Collection.is_active == True)
-        )
+        result = await self.session.execute(_GET_ACTIVE_COLLECTION_STMT, {"name": name})
         return result.scalar_one_or_none()
 
     async def list_all(self) -> list[Collection]:
         """List all collections."""
-        result = await self.session.execute(
-            select(Collection).order_by(Collection.name)
-        )
+        result = await self.session.execute(_LIST_COLLECTIONS_STMT)
         return list(result.scalars().all())
 
     async def list_active(self) -> list[Collection]:
         """List all active collections."""
-        result = await self.session.execute(
-            select(Collection).where(Collection.is_active == True).order_by(Collection.name)
-        )
+        result = await self.session.execute(_LIST_ACTIVE_COLLECTIONS_STMT)
         return list(result.scalars().all())
 
     async def create(self, name: str, api_key: str) -> Collection:
@@ -65,7 +118,9 @@ class CollectionRepository:
         await self.session.flush()
         return collection
 
-    async def get_or_create(self, name: str, api_key: str | None = None) -> tuple[Collection, str | None]:
+    async def get_or_create(
+        self, name: str, api_key: str | None = None
+    ) -> tuple[Collection, str | None]:
         """
         Get existing collection or create a new one.
 
@@ -100,14 +155,21 @@ class CollectionRepository:
             return False
         collection.api_key_hash = hash_api_key(api_key)
         await self.session.flush()
+        self._record_api_key_change(name)
         return True
 
     async def verify_api_key(self, name: str, api_key: str) -> bool:
-        """Verify an API key for a collection."""
-        collection = await self.get_active_by_name(name)
-        if collection is None:
-            return False
-        return collection.api_key_hash == hash_api_key(api_key)
+        """
+        Verify an API key for a collection.
+
+        The hash comparison happens in SQL as a single indexed lookup that returns
+        no row data. The compared values are SHA-256 digests of the keys, so the
+        comparison timing reveals nothing useful about the key itself.
+        """
+        result = await self.session.execute(
+            _VERIFY_API_KEY_STMT, {"name": name, "api_key_hash": hash_api_key(api_key)}
+        )
+        return result.scalar() is not None
 
     async def rotate_api_key(self, name: str) -> str | None:
         """Rotate the API key for a collection. Returns new key or None if not found."""
@@ -117,6 +179,7 @@ class CollectionRepository:
         new_key = generate_api_key()
         collection.api_key_hash = hash_api_key(new_key)
         await self.session.flush()
+        self._record_api_key_change(name)
         return new_key
 
     async def deactivate(self, name: str) -> bool:
@@ -124,6 +187,7 @@ class CollectionRepository:
         result = await self.session.execute(
             update(Collection).where(Collection.name == name).values(is_active=False)
         )
+        self._record_api_key_change(name)
         return result.rowcount > 0
 
 
@@ -135,33 +199,89 @@ class ObjectRepository:
 
     async def get_by_key(self, object_key: str) -> Object | None:
         """Get an object by its MinIO key."""
+        result = await self.session.execute(select(Object).where(Object.object_key == object_key))
+        return result.scalar_one_or_none()
+
+    async def get_ready_by_collection_and_name(self, collection: str, name: str) -> Object | None:
+        """Get a ready object by collection and name."""
         result = await self.session.execute(
-            select(Object).where(Object.object_key == object_key)
+            _GET_READY_BY_NAME_STMT, {"collection": collection, "name": name}
         )
         return result.scalar_one_or_none()
 
-    async def get_ready_by_collection_and_name(
+    async def get_ready_ref_by_collection_and_name(
         self, collection: str, name: str
-    ) -> Object | None:
-        """Get a ready object by collection and name."""
+    ) -> Row[tuple[str, str, int]] | None:
+        """
+        Get the storage key, hash and size of a ready object.
+
+        Returns a row with object_key, hash_sha256 and size_bytes attributes,
+        selected without loading the full Object.
+        """
         result = await self.session.execute(
-            select(Object).where(
-                Object.collection == collection,
-                Object.name == name,
-                Object.status == ObjectStatus.READY,
-            )
+            _GET_READY_REF_STMT, {"collection": collection, "name": name}
         )
-        return result.scalar_one_or_none()
+        return result.one_or_none()
 
     async def list_ready_by_collection(self, collection: str) -> list[Object]:
         """List all ready objects in a collection."""
-        result = await self.session.execute(
-            select(Object)
-            .where(Object.collection == collection, Object.status == ObjectStatus.READY)
-            .order_by(Object.name)
-        )
+        result = await self.session.execute(_LIST_READY_STMT, {"collection": collection})
         return list(result.scalars().all())
 
+    async def list_ready_names_by_collection(self, collection: str) -> set[str]:
+        """Get the names of all ready objects in a collection (name column only)."""
+        result = await self.session.execute(_LIST_READY_NAMES_STMT, {"collection": collection})
+        return set(result.scalars())
+
+    async def list_all_ready_name_key(self) -> list[Row[tuple[str, str, str]]]:
+        """
+        List (collection, name, object_key) rows for ready objects of all collections.
+
+        One query for cross-collection checks, ordered by collection then name.
+        """
+        result = await self.session.execute(_LIST_ALL_READY_NAME_KEY_STMT)
+        return list(result.all())
+
+    async def iter_ready_name_hash(
+        self, collection: str, batch_size: int = 1000
+    ) -> AsyncGenerator[list[tuple[str, str]], None]:
+        """
+        Stream (name, hash_sha256) pairs for all ready objects in a collection.
+
+        Rows are fetched from a server-side cursor and yielded in batches, so
+        memory use stays bounded regardless of the collection size.
+        """
+        result = await self.session.stream(_LIST_READY_NAME_HASH_STMT, {"collection": collection})
+        async for partition in result.partitions(batch_size):
+            yield [tuple(row) for row in partition]
+
+    def _upsert_statement(self, rows: list[dict]):
+        """
+        Build an INSERT ... ON CONFLICT (object_key) DO UPDATE for object rows.
+
+        Returns None on backends without an upsert dialect construct.
+        """
+        dialect = self.session.get_bind().dialect.name
+        if dialect == "postgresql":
+            insert = postgresql.insert
+        elif dialect == "sqlite":
+            insert = sqlite.insert
+        else:
+            return None
+
+        stmt = insert(Object).values([{**row, "status": ObjectStatus.READY} for row in rows])
+        return stmt.on_conflict_do_update(
+            index_elements=[Object.object_key],
+            set_={
+                "collection": stmt.excluded.collection,
+                "name": stmt.excluded.name,
+                "hash_sha256": stmt.excluded.hash_sha256,
+                "size_bytes": stmt.excluded.size_bytes,
+                "status": stmt.excluded.status,
+                "updated_at": func.now(),
+            },
+        )
+
     async def create_or_replace(
         self,
         collection: str,
@@ -169,25 +289,48 @@ class ObjectRepository:
         object_key: str,
         hash_sha256: str,
         size_bytes: int,
-    ) -> Object:
-        """Create or replace an object. Deletes existing object with same key first."""
-        # Delete any existing object with same object_key (to handle UNIQUE constraint)
-        await self.session.execute(
-            delete(Object).where(Object.object_key == object_key)
-        )
+    ) -> None:
+        """
+        Create or replace an object in a single upsert keyed on object_key.
 
-        # Create new object
-        obj = Object(
-            collection=collection,
-            name=name,
-            object_key=object_key,
-            hash_sha256=hash_sha256,
-            size_bytes=size_bytes,
-            status=ObjectStatus.READY,
-        )
-        self.session.add(obj)
+        Backends without upsert support delete any existing object with the same
+        key and insert a new one instead.
+        """
+        row = {
+            "collection": collection,
+            "name": name,
+            "object_key": object_key,
+            "hash_sha256": hash_sha256,
+            "size_bytes": size_bytes,
+        }
+        stmt = self._upsert_statement([row])
+        if stmt is not None:
+            await self.session.execute(stmt)
+            return
+
+        # Delete any existing object with same object_key (to handle UNIQUE constraint)
+        await self.session.execute(delete(Object).where(Object.object_key == object_key))
+        self.session.add(Object(**row, status=ObjectStatus.READY))
         await self.session.flush()
-        return obj
+
+    async def bulk_create_or_replace(self, items: list[dict]) -> None:
+        """
+        Create or replace many objects with a few multi-row upserts.
+
+        Args:
+            items: Dicts with collection, name, object_key, hash_sha256 and size_bytes
+
+        On PostgreSQL and SQLite each batch is a single INSERT ... ON CONFLICT
+        (object_key) DO UPDATE; other backends fall back to create_or_replace.
+        """
+        for start in range(0, len(items), BULK_UPSERT_BATCH_SIZE):
+            batch = items[start : start + BULK_UPSERT_BATCH_SIZE]
+            stmt = self._upsert_statement(batch)
+            if stmt is None:
+                for item in batch:
+                    await self.create_or_replace(**item)
+            else:
+                await self.session.execute(stmt)
 
     async def mark_deleted(self, collection: str, name: str) -> bool:
         """Mark an object as deleted."""
@@ -198,7 +341,7 @@ class ObjectRepository:
                 Object.name == name,
                 Object.status == ObjectStatus.READY,
             )
-            .values(status=ObjectStatus.DELETED, updated_at=datetime.now(timezone.utc))
+            .values(status=ObjectStatus.DELETED, updated_at=func.now())
         )
         return result.rowcount > 0
 
@@ -207,6 +350,6 @@ class ObjectRepository:
         result = await self.session.execute(
             update(Object)
             .where(Object.object_key == object_key, Object.status == ObjectStatus.READY)
-            .values(status=ObjectStatus.DELETED, updated_at=datetime.now(timezone.utc))
+            .values(status=ObjectStatus.DELETED, updated_at=func.now())
         )
         return result.rowcount > 0
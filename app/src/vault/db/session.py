@@ -1,17 +1,41 @@
 """Database session management."""
 
+import logging
+import threading
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from typing import Annotated
 
+from fastapi import Depends
 from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from vault.config import get_settings
 from vault.db.models import Base
 
+logger = logging.getLogger(__name__)
+
+# Indexes superseded by newer ones in the models, dropped from existing databases
+_OBSOLETE_INDEXES = ("ix_objects_collection_status", "ix_objects_collection_name_status")
+
+# Compiled SQL statements cached by SQLAlchemy per engine (default 500)
+QUERY_CACHE_SIZE = 1200
+
+# Prepared statements cached per asyncpg connection (default 100)
+PREPARED_STATEMENT_CACHE_SIZE = 500
+
+# Connections kept open in the pool (SQLite, PostgreSQL)
+SQLITE_POOL_SIZE = 5
+POSTGRES_POOL_SIZE = 20
+
+# Connections beyond one collection's admission limit, for the watcher,
+# background checks and requests to other collections
+POOL_HEADROOM = 8
+
 _engine = None
 _session_factory = None
+_engine_lock = threading.Lock()
 
 
 def _set_sqlite_pragma(dbapi_conn, connection_record):
@@ -20,43 +44,78 @@ def _set_sqlite_pragma(dbapi_conn, connection_record):
     cursor.execute("PRAGMA journal_mode=WAL")
     cursor.execute("PRAGMA busy_timeout=60000")  # 60 second busy timeout
     cursor.execute("PRAGMA synchronous=NORMAL")  # Faster writes with WAL
+    cursor.execute("PRAGMA wal_autocheckpoint=1000")  # Checkpoint every 1000 pages
+    if get_settings().sqlite_performance_pragmas:
+        cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB page cache
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")  # Map up to 256 MiB of the file
     cursor.close()
 
 
+def _sync_indexes(sync_conn) -> None:
+    """Create indexes missing from tables that already existed, drop obsolete ones."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+    for name in _OBSOLETE_INDEXES:
+        sync_conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+def _create_engine():
+    """Create the async database engine for the configured database URL."""
+    settings = get_settings()
+
+    # Both backends keep a pool of open connections so requests don't pay
+    # for connection setup (and, on SQLite, the PRAGMAs) every time. A
+    # streamed listing holds its connection until the body is sent, so the
+    # pool must fit a collection's full admission limit of them.
+    max_connections = settings.api_max_concurrent_per_collection + POOL_HEADROOM
+    is_sqlite = "sqlite" in settings.database_url
+
+    if is_sqlite:
+        engine = create_async_engine(
+            settings.database_url,
+            echo=False,
+            query_cache_size=QUERY_CACHE_SIZE,
+            # Local file connections don't go stale: no pre-ping or recycling
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=SQLITE_POOL_SIZE,  # WAL allows concurrent readers
+            max_overflow=max_connections - SQLITE_POOL_SIZE,
+            connect_args={
+                "check_same_thread": False,
+                "timeout": 60,  # 60 second timeout for lock acquisition
+            },
+        )
+        # Register event listener to set PRAGMAs on each connection
+        # For async engines, we need to use the sync engine's pool events
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragma)
+    else:
+        connect_args = {}
+        if "asyncpg" in settings.database_url:
+            # Server-side prepared statements kept per connection
+            connect_args["prepared_statement_cache_size"] = PREPARED_STATEMENT_CACHE_SIZE
+        engine = create_async_engine(
+            settings.database_url,
+            echo=False,
+            query_cache_size=QUERY_CACHE_SIZE,
+            connect_args=connect_args,
+            pool_pre_ping=True,
+            pool_size=POSTGRES_POOL_SIZE,  # Increased from default 5
+            max_overflow=max_connections - POSTGRES_POOL_SIZE,
+            pool_recycle=1800,  # Recycle connections every 30 minutes
+            pool_timeout=60,  # 60s timeout waiting for connection
+        )
+    return engine
+
+
 def get_engine():
     """Get or create the async database engine."""
     global _engine
     if _engine is None:
-        settings = get_settings()
-
-        # For SQLite, use NullPool to avoid connection issues
-        # For other databases, use optimized pool settings
-        is_sqlite = "sqlite" in settings.database_url
-
-        if is_sqlite:
-            _engine = create_async_engine(
-                settings.database_url,
-                echo=False,
-                pool_pre_ping=True,
-                poolclass=NullPool,  # SQLite works better without pooling
-                connect_args={
-                    "check_same_thread": False,
-                    "timeout": 60,  # 60 second timeout for lock acquisition
-                },
-            )
-            # Register event listener to set PRAGMAs on each connection
-            # For async engines, we need to use the sync engine's pool events
-            event.listen(_engine.sync_engine, "connect", _set_sqlite_pragma)
-        else:
-            _engine = create_async_engine(
-                settings.database_url,
-                echo=False,
-                pool_pre_ping=True,
-                pool_size=20,           # Increased from default 5
-                max_overflow=30,        # Increased from default 10 (total: 50)
-                pool_recycle=3600,      # Recycle connections every hour
-                pool_timeout=60,        # 60s timeout waiting for connection
-            )
+        # Double-checked so concurrent first callers build only one engine
+        with _engine_lock:
+            if _engine is None:
+                _engine = _create_engine()
     return _engine
 
 
@@ -79,10 +138,18 @@ async def init_db() -> None:
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        # create_all skips existing tables, so bring their indexes up to date
+        await conn.run_sync(_sync_indexes)
 
         # Enable WAL mode for SQLite for better concurrent access
         if "sqlite" in settings.database_url:
-            await conn.execute(text("PRAGMA journal_mode=WAL"))
+            journal_mode = (await conn.execute(text("PRAGMA journal_mode=WAL"))).scalar()
+            # SQLite silently keeps the old mode (e.g. for in-memory databases)
+            if str(journal_mode).lower() != "wal":
+                logger.warning(
+                    f"SQLite journal_mode is '{journal_mode}', not WAL; "
+                    "concurrent readers will block on writes"
+                )
             await conn.execute(text("PRAGMA busy_timeout=60000"))  # 60 second busy timeout
 
 
@@ -99,14 +166,15 @@ async def reset_engine() -> None:
     """
     Reset the database engine (hot-reload friendly).
 
-    This disposes the current engine and creates a new one with fresh settings.
-    Useful when connection pool is exhausted or after configuration changes.
+    This disposes the current engine; a new one is created lazily by the next
+    caller of get_engine(). Useful when the connection pool is exhausted.
     """
     global _engine, _session_factory
 
-    old_engine = _engine
-    _engine = None
-    _session_factory = None
+    with _engine_lock:
+        old_engine = _engine
+        _engine = None
+        _session_factory = None
 
     if old_engine is not None:
         try:
@@ -114,9 +182,6 @@ async def reset_engine() -> None:
         except Exception:
             pass  # Ignore errors during dispose
 
-    # Get new engine (will be created on next request)
-    get_engine()
-
 
 @asynccontextmanager
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
@@ -135,3 +200,9 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """FastAPI dependency for database sessions."""
     async with get_session() as session:
         yield session
+
+
+# Request database session, committed and closed when the endpoint function
+# returns rather than after the response is sent, so streamed downloads and
+# listings don't hold a pooled connection for the whole transfer
+DbSessionDep = Annotated[AsyncSession, Depends(get_db_session, scope="function")]
@@ -5,7 +5,6 @@ import sys
 
 import uvicorn
 
-from vault.api.app import create_app
 from vault.config import get_settings
 
 
@@ -27,12 +26,16 @@ def main() -> None:
     setup_logging()
     settings = get_settings()
 
-    app = create_app()
-
+    # Passing the factory by import string lets each worker build its own app,
+    # so database engines and MinIO clients are created after the fork
     uvicorn.run(
-        app,
+        "vault.api.app:create_app",
+        factory=True,
         host=settings.api_host,
         port=settings.api_port,
+        loop="auto",  # uvloop where installed (not on Windows)
+        http="httptools",
+        workers=settings.api_workers,
         log_level="info",
     )
 
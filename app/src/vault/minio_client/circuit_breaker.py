@@ -52,15 +52,15 @@ class CircuitBreaker:
         self._state = CircuitState.CLOSED
         self._failure_count = 0
         self._success_count = 0
-        self._last_failure_time: float | None = None
-        self._lock = threading.RLock()
+        self._last_failure_time: float | None = None  # time.monotonic() of last failure
+        self._lock = threading.Lock()  # Never acquired recursively
 
     @property
     def state(self) -> CircuitState:
         """Get current circuit state, transitioning if timeout expired."""
         with self._lock:
             if self._state == CircuitState.OPEN:
-                if self._should_attempt_reset():
+                if self._should_attempt_reset(time.monotonic()):
                     self._transition_to(CircuitState.HALF_OPEN)
             return self._state
 
@@ -72,11 +72,16 @@ class CircuitBreaker:
     def is_open(self) -> bool:
         return self.state == CircuitState.OPEN
 
-    def _should_attempt_reset(self) -> bool:
-        """Check if enough time has passed to try half-open."""
+    @property
+    def last_failure_time(self) -> float | None:
+        """time.monotonic() of the last recorded failure, or None."""
+        return self._last_failure_time
+
+    def _should_attempt_reset(self, now: float) -> bool:
+        """Check if enough time has passed (as of monotonic ``now``) to try half-open."""
         if self._last_failure_time is None:
             return True
-        return (time.time() - self._last_failure_time) >= self.config.timeout
+        return (now - self._last_failure_time) >= self.config.timeout
 
     def _transition_to(self, state: CircuitState) -> None:
         """Transition to a new state."""
@@ -91,6 +96,13 @@ class CircuitBreaker:
 
     def record_success(self) -> None:
         """Record a successful call."""
+        # Fast path: while closed, a success only clears the failure count. The
+        # unlocked reset is benign; at worst it drops a concurrent failure.
+        if self._state == CircuitState.CLOSED:
+            if self._failure_count:
+                self._failure_count = 0
+            return
+
         with self._lock:
             if self._state == CircuitState.HALF_OPEN:
                 self._success_count += 1
@@ -104,7 +116,7 @@ class CircuitBreaker:
         """Record a failed call."""
         with self._lock:
             self._failure_count += 1
-            self._last_failure_time = time.time()
+            self._last_failure_time = time.monotonic()
 
             if self._state == CircuitState.HALF_OPEN:
                 # Any failure in half-open immediately opens
@@ -115,14 +127,22 @@ class CircuitBreaker:
 
     def check_state(self) -> None:
         """Check if request should proceed, raise if circuit is open."""
-        current_state = self.state  # This may transition from OPEN to HALF_OPEN
+        # Fast path: a closed circuit has no pending transition, so skip the lock
+        if self._state == CircuitState.CLOSED:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            # Transition from OPEN to HALF_OPEN once the timeout has expired
+            if self._state == CircuitState.OPEN and self._should_attempt_reset(now):
+                self._transition_to(CircuitState.HALF_OPEN)
+            current_state = self._state
+            last_failure_time = self._last_failure_time
 
         if current_state == CircuitState.OPEN:
             time_remaining = 0.0
-            if self._last_failure_time:
-                time_remaining = max(
-                    0, self.config.timeout - (time.time() - self._last_failure_time)
-                )
+            if last_failure_time is not None:
+                time_remaining = max(0, self.config.timeout - (now - last_failure_time))
             raise CircuitBreakerError(
                 f"Circuit breaker '{self.name}' is open. "
                 f"Service unavailable, retry in {time_remaining:.1f}s",
@@ -137,12 +157,16 @@ class CircuitBreaker:
 
     def get_status(self) -> dict:
         """Get circuit breaker status for monitoring."""
+        last_failure_time = self._last_failure_time
+        if last_failure_time is not None:
+            # Report as a wall-clock timestamp
+            last_failure_time = time.time() - (time.monotonic() - last_failure_time)
         return {
             "name": self.name,
             "state": self.state.value,
             "failure_count": self._failure_count,
             "success_count": self._success_count,
-            "last_failure_time": self._last_failure_time,
+            "last_failure_time": last_failure_time,
             "config": {
                 "failure_threshold": self.config.failure_threshold,
                 "success_threshold": self.config.success_threshold,
@@ -5,12 +5,20 @@ import logging
 import time
 from typing import Callable, Coroutine, Any
 
+from vault.api.auth import get_auth_rate_limiter
 from vault.monitoring.health import check_consistency, check_watcher, ComponentStatus
 from vault.monitoring.metrics import metrics
 from vault.watcher.watcher import get_watcher
 
 logger = logging.getLogger(__name__)
 
+# Loop intervals (seconds)
+WATCHER_HEALTH_INTERVAL = 30
+WATCHER_QUIET_WARNING_AGE = 600  # Warn when no watcher events for this long
+CONSISTENCY_CHECK_INTERVAL = 300
+CONSISTENCY_INITIAL_DELAY = 60  # Let the system stabilize first
+RATE_LIMITER_GC_INTERVAL = 60
+
 
 class BackgroundTaskManager:
     """
@@ -19,6 +27,7 @@ class BackgroundTaskManager:
     Tasks:
     - Watcher health monitoring (auto-restart on thread death)
     - Periodic consistency checks
+    - Rate limiter cleanup
     - Metrics updates
     """
 
@@ -39,6 +48,7 @@ class BackgroundTaskManager:
         self._tasks = [
             asyncio.create_task(self._watcher_health_loop(), name="watcher_health"),
             asyncio.create_task(self._consistency_check_loop(), name="consistency_check"),
+            asyncio.create_task(self._rate_limiter_gc_loop(), name="rate_limiter_gc"),
         ]
 
         logger.info("Background monitoring tasks started")
@@ -61,31 +71,47 @@ class BackgroundTaskManager:
 
         logger.info("Background monitoring tasks stopped")
 
+    async def _wait(self, timeout: float, *events: asyncio.Event) -> bool:
+        """
+        Sleep until timeout, stop() or any of the given events, whichever comes first.
+
+        Returns:
+            True if the manager is stopping
+        """
+        waiters = [asyncio.ensure_future(event.wait()) for event in (self._stop_event, *events)]
+        try:
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+        return self._stop_event.is_set()
+
     async def _watcher_health_loop(self) -> None:
         """
         Monitor watcher health and auto-restart if thread dies.
 
-        Checks every 30 seconds.
+        Checks every 30 seconds, or as soon as the observer thread dies.
         """
-        check_interval = 30  # seconds
-
         while self._running:
             try:
-                await asyncio.sleep(check_interval)
-
                 watcher = get_watcher()
+                if await self._wait(WATCHER_HEALTH_INTERVAL, watcher.observer_died):
+                    break
 
                 # Check if watcher should be running but observer is dead
-                if watcher.is_running and not watcher.observer_alive:
+                # (observer_died is set while the dying thread may still be alive)
+                if watcher.is_running and (
+                    watcher.observer_died.is_set() or not watcher.observer_alive
+                ):
                     logger.error("Watcher observer thread is dead, restarting...")
                     watcher.restart()
                     continue
 
                 # Log status periodically
-                status = watcher.get_health_status()
-                if status["last_event_age_s"] and status["last_event_age_s"] > 600:
+                age = watcher.last_event_age
+                if age and age > WATCHER_QUIET_WARNING_AGE:
                     logger.warning(
-                        f"No watcher events in {status['last_event_age_s']:.0f}s - "
+                        f"No watcher events in {age:.0f}s - "
                         "this may be normal if no files are changing"
                     )
 
@@ -93,7 +119,7 @@ class BackgroundTaskManager:
                 break
             except Exception as e:
                 logger.error(f"Error in watcher health loop: {e}")
-                await asyncio.sleep(5)  # Brief pause before retry
+                await self._wait(5)  # Brief pause before retry
 
     async def _consistency_check_loop(self) -> None:
         """
@@ -101,10 +127,8 @@ class BackgroundTaskManager:
 
         Runs every 5 minutes by default.
         """
-        check_interval = 300  # 5 minutes
-
-        # Initial delay to let system stabilize
-        await asyncio.sleep(60)
+        if await self._wait(CONSISTENCY_INITIAL_DELAY):
+            return
 
         while self._running:
             try:
@@ -123,13 +147,36 @@ class BackgroundTaskManager:
                 elif result.status == ComponentStatus.DEGRADED:
                     logger.warning(f"Consistency check DEGRADED: {result.message}")
 
-                await asyncio.sleep(check_interval)
+                if await self._wait(CONSISTENCY_CHECK_INTERVAL):
+                    break
 
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Error in consistency check loop: {e}")
-                await asyncio.sleep(60)  # Brief pause before retry
+                await self._wait(60)  # Brief pause before retry
+
+    async def _rate_limiter_gc_loop(self) -> None:
+        """
+        Sweep expired auth rate limiter state.
+
+        Blocks are otherwise only removed when the same IP/collection is seen
+        again, so traffic from many distinct IPs would keep them around.
+        Runs every 60 seconds.
+        """
+        while self._running:
+            try:
+                if await self._wait(RATE_LIMITER_GC_INTERVAL):
+                    break
+
+                removed = await get_auth_rate_limiter().purge_expired()
+                if removed:
+                    logger.debug(f"Rate limiter cleanup removed {removed} expired keys")
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in rate limiter cleanup loop: {e}")
 
 
 # Global task manager
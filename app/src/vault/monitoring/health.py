@@ -2,10 +2,15 @@
 
 import asyncio
 import logging
+import os
 import time
+from collections.abc import Callable
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, Optional
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Any
 
 from sqlalchemy import text
 
@@ -15,6 +20,21 @@ from vault.monitoring.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
+# Objects per collection whose presence in MinIO a consistency check verifies
+CONSISTENCY_SAMPLE_SIZE = 5
+
+# Seconds a successful database probe is reused by later health checks
+DB_HEALTH_CACHE_TTL = 1.0
+_last_db_ok = float("-inf")  # time.monotonic() of the last successful probe
+_last_db_latency_ms = 0.0
+
+# Same for MinIO, reused for settings.minio_health_ttl seconds
+_last_minio_ok = float("-inf")
+_last_minio_latency_ms = 0.0
+
+# (pool, pool class name, size method, checkedout method) of the last pool seen
+_pool_accessors: tuple[Any, str, Callable | None, Callable | None] | None = None
+
 
 class ComponentStatus(str, Enum):
     """Health status of a component."""
@@ -33,7 +53,7 @@ class ComponentHealth:
     status: ComponentStatus
     latency_ms: float
     message: str = ""
-    details: Optional[Dict[str, Any]] = None
+    details: dict[str, Any] | None = None
 
 
 @dataclass
@@ -42,48 +62,62 @@ class SystemHealth:
 
     status: ComponentStatus
     timestamp: float
-    components: Dict[str, ComponentHealth]
+    components: dict[str, ComponentHealth]
     critical_failures: list
 
 
+def _pool_status(pool: Any) -> str:
+    """Describe a connection pool's size and usage, if its class reports them."""
+    global _pool_accessors
+
+    # The pool class only changes when the engine is rebuilt, so look up the
+    # stat methods once per pool rather than on every probe
+    if _pool_accessors is None or _pool_accessors[0] is not pool:
+        pool_class = type(pool).__name__
+        size = getattr(pool, "size", None)
+        checkedout = getattr(pool, "checkedout", None)
+        _pool_accessors = (
+            pool,
+            pool_class,
+            size if callable(size) else None,
+            checkedout if callable(checkedout) else None,
+        )
+
+    _, pool_class, size, checkedout = _pool_accessors
+    if size is None or checkedout is None:
+        return pool_class
+    try:
+        return f"{pool_class}: size={size()}, checked_out={checkedout()}"
+    except Exception:
+        return "unknown"
+
+
 async def check_database() -> ComponentHealth:
     """Check database connectivity and performance."""
     name = "database"
     start = time.time()
 
-    try:
-        async with get_session() as session:
-            result = await asyncio.wait_for(
-                session.execute(text("SELECT 1")),
-                timeout=5.0,
-            )
-            _ = result.scalar()
-
-        latency = (time.time() - start) * 1000
+    global _last_db_ok, _last_db_latency_ms
 
-        # Get pool stats
-        engine = get_engine()
-        pool_status = "NullPool (SQLite)"
-        try:
-            pool = engine.pool
-            pool_class = type(pool).__name__
-            if pool_class != "NullPool":
-                size = getattr(pool, "size", lambda: "N/A")
-                size = size() if callable(size) else size
-                checkedout = getattr(pool, "checkedout", lambda: "N/A")
-                checkedout = checkedout() if callable(checkedout) else checkedout
-                pool_status = f"{pool_class}: size={size}, checked_out={checkedout}"
-            else:
-                pool_status = pool_class
-        except Exception:
-            pass
+    try:
+        # A success within the last DB_HEALTH_CACHE_TTL seconds stands in for
+        # the probe, so bursts of health requests cost one SELECT 1
+        if time.monotonic() - _last_db_ok >= DB_HEALTH_CACHE_TTL:
+            async with get_session() as session:
+                result = await asyncio.wait_for(
+                    session.execute(text("SELECT 1")),
+                    timeout=5.0,
+                )
+                _ = result.scalar()
+            _last_db_ok = time.monotonic()
+            _last_db_latency_ms = (time.time() - start) * 1000
 
         return ComponentHealth(
             name=name,
             status=ComponentStatus.UP,
-            latency_ms=latency,
+            latency_ms=_last_db_latency_ms,
             message="Database operational",
-            details={"pool_status": pool_status},
+            details={"pool_status": _pool_status(get_engine().pool)},
         )
 
     except asyncio.TimeoutError:
@@ -110,10 +144,27 @@ async def check_minio() -> ComponentHealth:
     name = "minio"
     start = time.time()
 
+    global _last_minio_ok, _last_minio_latency_ms
+
     try:
+        from vault.minio_client.circuit_breaker import minio_circuit_breaker
         from vault.minio_client.client import get_minio_client
 
         settings = get_settings()
+
+        # Trust a recent successful probe unless a MinIO operation failed since
+        last_failure = minio_circuit_breaker.last_failure_time
+        if time.monotonic() - _last_minio_ok < settings.minio_health_ttl and (
+            last_failure is None or last_failure < _last_minio_ok
+        ):
+            return ComponentHealth(
+                name=name,
+                status=ComponentStatus.UP,
+                latency_ms=_last_minio_latency_ms,
+                message="MinIO operational",
+                details={"bucket": settings.minio_bucket},
+            )
+
         client = get_minio_client()
 
         # Test bucket exists
@@ -133,6 +184,9 @@ async def check_minio() -> ComponentHealth:
                 message=f"Bucket '{settings.minio_bucket}' does not exist",
             )
 
+        _last_minio_ok = time.monotonic()
+        _last_minio_latency_ms = latency
+
         return ComponentHealth(
             name=name,
             status=ComponentStatus.UP,
@@ -160,6 +214,38 @@ async def check_minio() -> ComponentHealth:
         )
 
 
+def _probe_filesystem(root: Path) -> None:
+    """
+    Write and read back a small file under root.
+
+    Uses an unnamed O_TMPFILE file where supported (Linux), so no directory
+    entry is created and the watcher sees no events; otherwise falls back to
+    a named .health_check file that is removed afterwards.
+    """
+    o_tmpfile = getattr(os, "O_TMPFILE", None)
+    if o_tmpfile is not None:
+        try:
+            fd = os.open(root, o_tmpfile | os.O_RDWR, 0o600)
+        except OSError:
+            fd = None  # Filesystem without O_TMPFILE support
+        if fd is not None:
+            try:
+                os.write(fd, b"ok")
+                if os.pread(fd, 2, 0) != b"ok":
+                    raise ValueError("Read content mismatch")
+            finally:
+                os.close(fd)
+            return
+
+    test_file = root / ".health_check"
+    test_file.write_text("ok")
+    try:
+        if test_file.read_text() != "ok":
+            raise ValueError("Read content mismatch")
+    finally:
+        test_file.unlink()
+
+
 async def check_filesystem() -> ComponentHealth:
     """Check filesystem accessibility."""
     name = "filesystem"
@@ -167,18 +253,7 @@ async def check_filesystem() -> ComponentHealth:
 
     try:
         settings = get_settings()
-        test_file = settings.collections_root / ".health_check"
-
-        # Test write
-        test_file.write_text("ok")
-
-        # Test read
-        content = test_file.read_text()
-        if content != "ok":
-            raise ValueError("Read content mismatch")
-
-        # Cleanup
-        test_file.unlink()
+        _probe_filesystem(settings.collections_root)
 
         latency = (time.time() - start) * 1000
 
@@ -212,7 +287,6 @@ async def check_watcher() -> ComponentHealth:
 
         is_running = watcher.is_running
         observer_alive = False
-        last_event_age = None
 
         if hasattr(watcher, "observer") and watcher.observer is not None:
             # PollingObserver inherits from threading.Thread
@@ -221,9 +295,7 @@ async def check_watcher() -> ComponentHealth:
             elif hasattr(watcher.observer, "_thread") and watcher.observer._thread is not None:
                 observer_alive = watcher.observer._thread.is_alive()
 
-        # Check last event time if available
-        if hasattr(watcher, "_last_event_time"):
-            last_event_age = time.time() - watcher._last_event_time
+        last_event_age = watcher.last_event_age
 
         latency = (time.time() - start) * 1000
 
@@ -278,42 +350,53 @@ async def check_consistency() -> ComponentHealth:
     start = time.time()
 
     try:
-        from vault.sync.state import get_folder_files, get_processing_files_for_collection
         from vault.db.repository import CollectionRepository, ObjectRepository
         from vault.minio_client.client import object_exists
+        from vault.sync.state import get_folder_files, get_processing_files_for_collection
 
         settings = get_settings()
         pending_total = 0
         orphaned_total = 0
-        missing_total = 0
         collections_checked = 0
+        sample_keys: list[str] = []
 
         async with get_session() as session:
             collection_repo = CollectionRepository(session)
             object_repo = ObjectRepository(session)
             collections = await collection_repo.list_all()
+            # Ready objects of every collection in one query
+            ready_rows = await object_repo.list_all_ready_name_key()
+
+        known = {collection.name for collection in collections}
+        db_files_by_collection: dict[str, set[str]] = {}
+        for collection_name, group in groupby(ready_rows, key=itemgetter(0)):
+            if collection_name not in known:
+                continue
+            names = db_files_by_collection[collection_name] = set()
+            for i, (_, obj_name, object_key) in enumerate(group):
+                names.add(obj_name)
+                # Check MinIO for DB objects (sample check, not all)
+                if i < CONSISTENCY_SAMPLE_SIZE:
+                    sample_keys.append(object_key)
 
-            for collection in collections:
-                collections_checked += 1
-                collection_name = collection.name
-
-                # Get folder files
-                folder_files = get_folder_files(collection_name)
-                processing_files = get_processing_files_for_collection(collection_name)
+        for collection in collections:
+            collections_checked += 1
+            collection_name = collection.name
 
-                # Get DB files
-                db_objects = await object_repo.list_ready_by_collection(collection_name)
-                db_files = {obj.name for obj in db_objects}
+            # Get folder files
+            folder_files = get_folder_files(collection_name)
+            processing_files = get_processing_files_for_collection(collection_name)
 
-                # Pending: in folder but not in DB
-                pending = folder_files - db_files - processing_files
-                pending_total += len(pending)
+            # Pending: in folder but not in DB
+            db_files = db_files_by_collection.get(collection_name, set())
+            pending = folder_files - db_files - processing_files
+            pending_total += len(pending)
 
-                # Check MinIO for DB objects (sample check, not all)
-                sample_size = min(5, len(db_objects))
-                for obj in list(db_objects)[:sample_size]:
-                    if not object_exists(obj.object_key):
-                        missing_total += 1
+        # Probe all sampled objects concurrently, outside the DB session
+        exists = await asyncio.gather(
+            *(asyncio.to_thread(object_exists, key) for key in sample_keys)
+        )
+        missing_total = exists.count(False)
 
         latency = (time.time() - start) * 1000
 
@@ -4,41 +4,60 @@ Simple in-memory metrics that can be scraped via /metrics endpoint.
 For production, integrate with prometheus_client library.
 """
 
+import itertools
 import threading
-import time
-from dataclasses import dataclass, field
-from typing import Dict, List
+from bisect import bisect_left
+from collections.abc import Iterable
+from typing import Any
 
 
-@dataclass
 class Counter:
-    """Simple counter metric."""
+    """
+    Simple counter metric.
 
-    name: str
-    description: str
-    _value: float = 0.0
-    _lock: threading.Lock = field(default_factory=threading.Lock)
+    Increments are added to a cell owned by the calling thread: with a single
+    writer per cell no lock is needed, and the registration lock is taken once
+    per thread. get() sums the cells, including those of threads that have
+    exited.
+    """
+
+    __slots__ = ("name", "description", "_cells", "_local", "_cells_lock")
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._cells: list[list[float]] = []
+        self._local = threading.local()
+        self._cells_lock = threading.Lock()
 
     def inc(self, value: float = 1.0) -> None:
-        with self._lock:
-            self._value += value
+        cell = getattr(self._local, "cell", None)
+        if cell is None:
+            cell = self._local.cell = [0.0]
+            with self._cells_lock:
+                self._cells.append(cell)
+        cell[0] += value
 
     def get(self) -> float:
-        return self._value
+        # A concurrent increment is either counted or not, which is fine for a
+        # monotonic counter
+        return sum((cell[0] for cell in self._cells), 0.0)
 
 
-@dataclass
 class Gauge:
     """Simple gauge metric."""
 
-    name: str
-    description: str
-    _value: float = 0.0
-    _lock: threading.Lock = field(default_factory=threading.Lock)
+    __slots__ = ("name", "description", "_value", "_lock")
+
+    def __init__(self, name: str, description: str, value: float = 0.0):
+        self.name = name
+        self.description = description
+        self._value = value
+        self._lock = threading.Lock()
 
     def set(self, value: float) -> None:
-        with self._lock:
-            self._value = value
+        # A single attribute store is atomic; inc/dec still lock to not lose updates
+        self._value = value
 
     def inc(self, value: float = 1.0) -> None:
         with self._lock:
@@ -52,30 +71,30 @@ class Gauge:
         return self._value
 
 
-@dataclass
 class Histogram:
     """Simple histogram metric with buckets."""
 
-    name: str
-    description: str
-    buckets: List[float] = field(default_factory=lambda: [0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0])
-    _counts: Dict[float, int] = field(default_factory=dict)
-    _sum: float = 0.0
-    _count: int = 0
-    _lock: threading.Lock = field(default_factory=threading.Lock)
+    DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0)
 
-    def __post_init__(self):
-        self._counts = {b: 0 for b in self.buckets}
-        self._counts[float("inf")] = 0
+    __slots__ = ("name", "description", "buckets", "_counts", "_sum", "_count", "_lock")
+
+    def __init__(self, name: str, description: str, buckets: Iterable[float] | None = None):
+        self.name = name
+        self.description = description
+        self.buckets: list[float] = sorted(self.DEFAULT_BUCKETS if buckets is None else buckets)
+        # Per-bucket (non-cumulative) counts; the last slot is the +Inf bucket
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
 
     def observe(self, value: float) -> None:
+        # First bucket whose upper bound is >= value (bounds are inclusive)
+        idx = bisect_left(self.buckets, value)
         with self._lock:
             self._sum += value
             self._count += 1
-            for bucket in self.buckets:
-                if value <= bucket:
-                    self._counts[bucket] += 1
-            self._counts[float("inf")] += 1
+            self._counts[idx] += 1
 
     def get_count(self) -> int:
         return self._count
@@ -83,6 +102,13 @@ class Histogram:
     def get_sum(self) -> float:
         return self._sum
 
+    def get_buckets(self) -> dict[float, int]:
+        """Cumulative counts per upper bound, +Inf included (Prometheus semantics)."""
+        with self._lock:
+            counts = list(self._counts)
+        bounds = [*self.buckets, float("inf")]
+        return dict(zip(bounds, itertools.accumulate(counts)))
+
 
 class MetricsRegistry:
     """Registry for all vault metrics."""
@@ -162,6 +188,10 @@ class MetricsRegistry:
             "vault_watcher_semaphore_queue_depth",
             "Number of files waiting for semaphore",
         )
+        self.watcher_files_queued = Gauge(
+            "vault_watcher_files_queued",
+            "Number of settled files waiting for a watcher task slot",
+        )
         self.watcher_thread_restarts = Counter(
             "vault_watcher_thread_restarts_total",
             "Total watcher thread restarts",
@@ -221,43 +251,70 @@ class MetricsRegistry:
             "Timestamp of last health check",
         )
 
-    def get_all_metrics(self) -> Dict[str, float]:
+        # Classify the metrics once, in definition order, for the scrape paths
+        self._metrics: tuple[Counter | Gauge | Histogram, ...] = tuple(
+            value for value in vars(self).values() if isinstance(value, (Counter, Gauge, Histogram))
+        )
+        # HELP/TYPE lines never change, so only value lines are built per scrape.
+        # Everything is pre-encoded so a scrape is rendered straight to bytes.
+        self._prometheus_layout = tuple(
+            (value, *self._prometheus_lines(value)) for value in self._metrics
+        )
+
+    @staticmethod
+    def _prometheus_lines(value: Counter | Gauge | Histogram) -> tuple[bytes, Any]:
+        """Pre-render a metric's HELP/TYPE header and the prefixes of its value lines."""
+        if isinstance(value, Histogram):
+            kind = "histogram"
+            bounds = [f"{bound:g}" for bound in value.buckets] + ["+Inf"]
+            prefixes: Any = (
+                tuple(f'{value.name}_bucket{{le="{le}"}} '.encode() for le in bounds),
+                f"{value.name}_count ".encode(),
+                f"{value.name}_sum ".encode(),
+            )
+        else:
+            kind = "counter" if isinstance(value, Counter) else "gauge"
+            prefixes = f"{value.name} ".encode()
+        header = f"# HELP {value.name} {value.description}\n# TYPE {value.name} {kind}\n"
+        return header.encode(), prefixes
+
+    def get_all_metrics(self) -> dict[str, float]:
         """Get all metrics as a dictionary."""
         result = {}
-        for name, value in vars(self).items():
-            if isinstance(value, Counter):
-                result[value.name] = value.get()
-            elif isinstance(value, Gauge):
-                result[value.name] = value.get()
-            elif isinstance(value, Histogram):
+        for value in self._metrics:
+            if isinstance(value, Histogram):
                 result[f"{value.name}_count"] = value.get_count()
                 result[f"{value.name}_sum"] = value.get_sum()
+            else:
+                result[value.name] = value.get()
         return result
 
+    def export_prometheus_bytes(self) -> bytes:
+        """Render metrics in Prometheus exposition format as UTF-8 bytes."""
+        parts: list[bytes] = []
+        append = parts.append
+        # %a renders numbers as repr(), identical to str() for ints and floats
+        for value, header, prefixes in self._prometheus_layout:
+            append(header)
+            if isinstance(value, Histogram):
+                bucket_prefixes, count_prefix, sum_prefix = prefixes
+                for bucket_prefix, count in zip(bucket_prefixes, value.get_buckets().values()):
+                    append(b"%b%a\n" % (bucket_prefix, count))
+                append(b"%b%a\n" % (count_prefix, value.get_count()))
+                append(b"%b%a\n" % (sum_prefix, value.get_sum()))
+            else:
+                append(b"%b%a\n" % (prefixes, value.get()))
+        return b"".join(parts)
+
     def format_prometheus(self) -> str:
         """Format metrics in Prometheus exposition format."""
-        lines = []
-        for name, value in vars(self).items():
-            if isinstance(value, Counter):
-                lines.append(f"# HELP {value.name} {value.description}")
-                lines.append(f"# TYPE {value.name} counter")
-                lines.append(f"{value.name} {value.get()}")
-            elif isinstance(value, Gauge):
-                lines.append(f"# HELP {value.name} {value.description}")
-                lines.append(f"# TYPE {value.name} gauge")
-                lines.append(f"{value.name} {value.get()}")
-            elif isinstance(value, Histogram):
-                lines.append(f"# HELP {value.name} {value.description}")
-                lines.append(f"# TYPE {value.name} histogram")
-                lines.append(f"{value.name}_count {value.get_count()}")
-                lines.append(f"{value.name}_sum {value.get_sum()}")
-        return "\n".join(lines)
+        return self.export_prometheus_bytes().decode()
 
     def export_prometheus(self) -> str:
         """Alias for format_prometheus for consistency with router."""
         return self.format_prometheus()
 
-    def export_json(self) -> Dict[str, float]:
+    def export_json(self) -> dict[str, float]:
         """Alias for get_all_metrics for consistency with router."""
         return self.get_all_metrics()
 
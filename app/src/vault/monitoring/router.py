@@ -6,6 +6,7 @@ from typing import Any, Dict
 
 from fastapi import APIRouter, Query, Response
 
+from vault.api.responses import ORJSONResponse
 from vault.monitoring.health import (
     ComponentStatus,
     get_system_health,
@@ -39,11 +40,9 @@ async def readiness() -> Dict[str, Any]:
     health = await get_system_health(include_consistency=False)
 
     if health.status == ComponentStatus.DOWN:
-        return Response(
-            content='{"status": "not_ready", "critical_failures": ' +
-                    str(health.critical_failures).replace("'", '"') + '}',
+        return ORJSONResponse(
+            {"status": "not_ready", "critical_failures": health.critical_failures},
             status_code=503,
-            media_type="application/json",
         )
 
     return {
@@ -91,11 +90,7 @@ async def status(
 
     # Return 503 if system is down
     if health.status == ComponentStatus.DOWN:
-        return Response(
-            content=str(response).replace("'", '"'),
-            status_code=503,
-            media_type="application/json",
-        )
+        return ORJSONResponse(response, status_code=503)
 
     return response
 
@@ -107,9 +102,8 @@ async def prometheus_metrics() -> Response:
 
     Returns metrics in Prometheus text format for scraping.
     """
-    output = metrics.export_prometheus()
     return Response(
-        content=output,
+        content=metrics.export_prometheus_bytes(),
         media_type="text/plain; version=0.0.4; charset=utf-8",
     )
 
@@ -4,6 +4,7 @@ from vault.sync.state import (
     SyncState,
     get_sync_state,
     is_collection_synced,
+    sync_state_snapshot,
     wait_for_sync,
 )
 
@@ -11,5 +12,6 @@ __all__ = [
     "SyncState",
     "get_sync_state",
     "is_collection_synced",
+    "sync_state_snapshot",
     "wait_for_sync",
 ]
@@ -9,16 +9,16 @@ This module provides utilities to:
 
 import asyncio
 import logging
+import os
+import time
 from dataclasses import dataclass
-from pathlib import Path
-from typing import Optional, Set
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from vault.config import get_settings
 from vault.db.repository import ObjectRepository
 from vault.db.session import get_session
-from vault.watcher.handler import _files_in_progress, _processing_lock, should_ignore
+from vault.watcher.handler import RACY_MTIME_NS, get_in_progress_names, should_ignore
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +28,21 @@ DEFAULT_SYNC_TIMEOUT = 30.0
 # Polling interval when waiting for sync (seconds)
 SYNC_POLL_INTERVAL = 0.5
 
+# Polls that may reuse an unchanged state before wait_for_sync checks fully again
+SYNC_FULL_CHECK_POLLS = 4
+
+
+# Collections root as a string, resolved from settings on first use
+_collections_root: str | None = None
+
+
+def _root() -> str:
+    """Get the collections root path, caching it on first use."""
+    global _collections_root
+    if _collections_root is None:
+        _collections_root = str(get_settings().collections_root)
+    return _collections_root
+
 
 @dataclass
 class SyncState:
@@ -38,52 +53,75 @@ class SyncState:
     files_in_folder: int
     files_in_db: int
     files_processing: int
-    pending_files: Set[str]  # Files in folder but not in DB
+    pending_files: set[str]  # Files in folder but not in DB (empty unless computed)
+    pending_count: int  # Number of such files, always computed
 
 
-def get_folder_files(collection: str) -> Set[str]:
-    """
-    Get all files in a collection folder.
+# collection -> (folder mtime_ns, state) of the last check that found it synced
+_synced_snapshots: dict[str, tuple[int, SyncState]] = {}
 
-    Returns a set of filenames (not full paths).
-    """
-    settings = get_settings()
-    collection_path = settings.collections_root / collection
 
-    if not collection_path.exists() or not collection_path.is_dir():
-        return set()
+def _folder_mtime_ns(collection: str) -> int | None:
+    """Get the mtime of a collection folder in nanoseconds, or None if missing."""
+    try:
+        return os.stat(os.path.join(_root(), collection)).st_mtime_ns
+    except OSError:
+        return None
 
-    files = set()
-    for item in collection_path.iterdir():
-        if item.is_file() and not should_ignore(item):
-            files.add(item.name)
 
-    return files
+def sync_state_snapshot(collection: str) -> SyncState | None:
+    """
+    Return the last synced state of a collection if it still holds, without awaiting.
+
+    The state is reused when the collection folder's mtime is unchanged since a
+    full check found it synced and the watcher has no file of it in progress.
+
+    Returns:
+        The cached SyncState, or None if a full check is needed
+    """
+    snapshot = _synced_snapshots.get(collection)
+    if snapshot is None:
+        return None
+    mtime_ns, state = snapshot
+    if _folder_mtime_ns(collection) != mtime_ns or get_processing_files_for_collection(collection):
+        return None
+    return state
 
 
-def get_processing_files_for_collection(collection: str) -> Set[str]:
+def get_folder_files(collection: str) -> set[str]:
     """
-    Get files currently being processed for a collection.
+    Get all files in a collection folder.
 
-    Note: This accesses the global _files_in_progress from the watcher handler.
+    Returns a set of filenames (not full paths).
     """
-    settings = get_settings()
-    collection_path = settings.collections_root / collection
-    collection_prefix = str(collection_path) + "/"
+    collection_path = os.path.join(_root(), collection)
+
+    # scandir reports file types from the directory listing itself, so only
+    # symlinks cost an extra stat
+    files = set()
+    try:
+        with os.scandir(collection_path) as entries:
+            for entry in entries:
+                name = entry.name
+                if should_ignore(name):
+                    continue
+                if entry.is_file():
+                    files.add(name)
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+
+    return files
 
-    processing = set()
-    # We don't need the lock for reading since we're just checking
-    for path_str in _files_in_progress:
-        if path_str.startswith(collection_prefix):
-            filename = Path(path_str).name
-            processing.add(filename)
 
-    return processing
+def get_processing_files_for_collection(collection: str) -> set[str]:
+    """Get files currently being processed for a collection."""
+    return get_in_progress_names(collection)
 
 
 async def get_sync_state(
     collection: str,
-    session: Optional[AsyncSession] = None,
+    session: AsyncSession | None = None,
+    compute_pending: bool = True,
 ) -> SyncState:
     """
     Get the current synchronization state for a collection.
@@ -94,7 +132,12 @@ async def get_sync_state(
     Args:
         collection: Collection name
         session: Optional existing database session to reuse (avoids creating new connections)
+        compute_pending: Build the pending_files set; when False only
+            pending_count is computed and pending_files is left empty
     """
+    # Taken before listing so a change made while we check invalidates the snapshot
+    folder_mtime_ns = _folder_mtime_ns(collection)
+
     # Get files in folder
     folder_files = get_folder_files(collection)
 
@@ -103,36 +146,55 @@ async def get_sync_state(
 
     # Get files in database - reuse session if provided
     if session is not None:
-        repo = ObjectRepository(session)
-        db_objects = await repo.list_ready_by_collection(collection)
-        db_files = {obj.name for obj in db_objects}
+        db_files = await ObjectRepository(session).list_ready_names_by_collection(collection)
     else:
         async with get_session() as new_session:
             repo = ObjectRepository(new_session)
-            db_objects = await repo.list_ready_by_collection(collection)
-            db_files = {obj.name for obj in db_objects}
+            db_files = await repo.list_ready_names_by_collection(collection)
 
     # Files in folder but not in DB (and not currently processing)
-    pending_files = folder_files - db_files - processing_files
+    if compute_pending:
+        pending_files = folder_files - db_files - processing_files
+        pending_count = len(pending_files)
+    else:
+        pending_files = set()
+        pending_count = sum(
+            1 for name in folder_files if name not in db_files and name not in processing_files
+        )
 
     # Collection is synced if:
     # 1. No files are being processed
     # 2. No files are pending (in folder but not in DB)
-    is_synced = len(processing_files) == 0 and len(pending_files) == 0
+    is_synced = len(processing_files) == 0 and pending_count == 0
 
-    return SyncState(
+    state = SyncState(
         collection=collection,
         is_synced=is_synced,
         files_in_folder=len(folder_files),
         files_in_db=len(db_files),
         files_processing=len(processing_files),
         pending_files=pending_files,
+        pending_count=pending_count,
     )
 
+    if (
+        is_synced
+        and folder_mtime_ns is not None
+        and time.time_ns() - folder_mtime_ns > RACY_MTIME_NS
+    ):
+        _synced_snapshots[collection] = (folder_mtime_ns, state)
+    else:
+        _synced_snapshots.pop(collection, None)
+
+    return state
 
-async def is_collection_synced(collection: str) -> bool:
+
+async def is_collection_synced(
+    collection: str,
+    session: AsyncSession | None = None,
+) -> bool:
     """Check if a collection is fully synchronized."""
-    state = await get_sync_state(collection)
+    state = await get_sync_state(collection, session=session)
     return state.is_synced
 
 
@@ -140,7 +202,7 @@ async def wait_for_sync(
     collection: str,
     timeout: float = DEFAULT_SYNC_TIMEOUT,
     poll_interval: float = SYNC_POLL_INTERVAL,
-    session: Optional[AsyncSession] = None,
+    session: AsyncSession | None = None,
 ) -> SyncState:
     """
     Wait for a collection to be fully synchronized.
@@ -149,29 +211,52 @@ async def wait_for_sync(
         collection: Collection name
         timeout: Maximum time to wait in seconds
         poll_interval: How often to check sync status
-        session: Optional existing database session to reuse (avoids creating 60+ connections during polling)
+        session: Optional existing database session to reuse; without one, a
+            single session is opened for all polls
 
     Returns:
         Final SyncState after waiting
 
     The function will return early if sync completes before timeout.
     """
+    if session is None:
+        async with get_session() as own_session:
+            return await wait_for_sync(collection, timeout, poll_interval, own_session)
+
     elapsed = 0.0
+    last_state: SyncState | None = None
+    last_mtime_ns: int | None = None
+    reused = 0
 
     while elapsed < timeout:
-        state = await get_sync_state(collection, session=session)
+        # While nothing is being processed and the folder is unchanged, the
+        # previous state still holds: pending files only move once the watcher
+        # starts processing them. Re-check fully every few polls regardless.
+        mtime_ns = _folder_mtime_ns(collection)
+        if (
+            last_state is not None
+            and reused < SYNC_FULL_CHECK_POLLS
+            and mtime_ns is not None
+            and mtime_ns == last_mtime_ns
+            and time.time_ns() - mtime_ns > RACY_MTIME_NS
+            and last_state.files_processing == 0
+            and not get_processing_files_for_collection(collection)
+        ):
+            state = last_state
+            reused += 1
+        else:
+            # Polls only need the counts; a synced state has no pending files anyway
+            state = await get_sync_state(collection, session=session, compute_pending=False)
+            last_state, last_mtime_ns, reused = state, mtime_ns, 0
 
         if state.is_synced:
-            logger.debug(
-                f"Collection '{collection}' is synced: "
-                f"{state.files_in_db} files in DB"
-            )
+            logger.debug(f"Collection '{collection}' is synced: {state.files_in_db} files in DB")
             return state
 
         logger.debug(
             f"Waiting for sync on '{collection}': "
             f"{state.files_processing} processing, "
-            f"{len(state.pending_files)} pending"
+            f"{state.pending_count} pending"
         )
 
         await asyncio.sleep(poll_interval)
@@ -183,7 +268,7 @@ async def wait_for_sync(
         logger.warning(
             f"Sync timeout for '{collection}' after {timeout}s: "
             f"{final_state.files_processing} still processing, "
-            f"{len(final_state.pending_files)} pending"
+            f"{final_state.pending_count} pending"
         )
 
     return final_state
@@ -2,15 +2,19 @@
 
 import asyncio
 import logging
+import os
+import stat
 import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from functools import partial
 from pathlib import Path
-from typing import Dict
 
 from watchdog.events import FileSystemEvent, FileSystemEventHandler
 
 from vault.config import get_settings
-from vault.db.repository import CollectionRepository, ObjectRepository
+from vault.db.repository import BULK_UPSERT_BATCH_SIZE, CollectionRepository, ObjectRepository
 from vault.db.session import get_session
 from vault.minio_client.circuit_breaker import CircuitBreakerError
 from vault.minio_client.client import (
@@ -23,14 +27,31 @@ from vault.monitoring.metrics import metrics
 logger = logging.getLogger(__name__)
 
 # Files to ignore
-IGNORED_FILES = {".vault_key", ".DS_Store"}
-
-# Debouncing: track files being processed and their last event time
-_processing_lock = asyncio.Lock()
-_files_in_progress: Dict[str, float] = {}  # path -> timestamp when processing started
-_last_event_time: Dict[str, float] = {}  # path -> last event timestamp
-DEBOUNCE_SECONDS = 2.0  # Ignore events for same file within this window
+IGNORED_FILES = frozenset({".vault_key", ".DS_Store"})
+
+# Track files being processed. These are only used on the event loop thread,
+# with no await between a check and its update, so they need no lock.
+# (collection, name) -> time.monotonic() when processing started
+_files_in_progress: dict[tuple[str, str], float] = {}
+# collection -> names of its files in _files_in_progress, for O(1) per-collection lookups
+_in_progress_by_collection: dict[str, set[str]] = {}
 PROCESSING_TIMEOUT = 300.0  # Consider stuck after 5 minutes
+# Quiet period a file's events must settle for before it is processed, so the
+# burst of events an editor emits for a single save (including atomic
+# delete/rename-over patterns) results in one upload
+QUIESCENCE_SECONDS = 0.25
+# Max file tasks the event handler runs at once. Settled paths beyond this wait in
+# a deduplicated queue instead of as thousands of coroutines (e.g. during cp -r)
+MAX_ACTIVE_FILE_TASKS = 8
+
+# (collection, name) -> (size, mtime_ns, sha256) of the last upload, so events for
+# files unchanged since then skip the hash and upload. Least recently used first.
+_hash_cache: "OrderedDict[tuple[str, str], tuple[int, int, str]]" = OrderedDict()
+HASH_CACHE_MAX_ENTRIES = 16384
+
+# Mtimes closer than this to the check time are not trusted, since a change
+# within the filesystem's timestamp granularity may not move the mtime
+RACY_MTIME_NS = 2_000_000_000
 
 # Semaphore to limit concurrent file processing operations (prevents DB connection pool exhaustion)
 # For SQLite, we need to keep this low (3) to avoid "database is locked" errors
@@ -40,6 +61,125 @@ SEMAPHORE_TIMEOUT = 60.0  # Max time to wait for semaphore
 _queue_depth = 0  # Track how many are waiting for semaphore
 
 
+# Collections root and its "<root>/" string prefix, resolved from settings on first use
+_collections_root: Path | None = None
+_collections_root_prefix = ""
+
+
+def _root() -> Path:
+    """Get the collections root, caching it (and its path prefix) on first use."""
+    global _collections_root, _collections_root_prefix
+    if _collections_root is None:
+        root = get_settings().collections_root
+        _collections_root_prefix = os.path.join(str(root), "")
+        _collections_root = root
+    return _collections_root
+
+
+def _root_prefix() -> str:
+    """Get the collections root followed by a separator, for prefix checks on path strings."""
+    if _collections_root is None:
+        _root()
+    return _collections_root_prefix
+
+
+# Collections known to exist in the database, so per-file events skip the lookup.
+# Only touched on the event loop thread; cleared whenever the watcher (re)starts.
+_known_collections: set[str] = set()
+
+
+def forget_known_collections() -> None:
+    """Drop the known-collections cache so collections are looked up again."""
+    _known_collections.clear()
+
+
+def _mark_in_progress(collection_name: str, object_name: str, now: float) -> None:
+    """Record a file as being processed."""
+    _files_in_progress[(collection_name, object_name)] = now
+    _in_progress_by_collection.setdefault(collection_name, set()).add(object_name)
+
+
+def _clear_in_progress(collection_name: str, object_name: str) -> None:
+    """Forget a file being processed."""
+    _files_in_progress.pop((collection_name, object_name), None)
+    names = _in_progress_by_collection.get(collection_name)
+    if names is not None:
+        names.discard(object_name)
+        if not names:
+            del _in_progress_by_collection[collection_name]
+
+
+def get_in_progress_names(collection_name: str) -> set[str]:
+    """Get a copy of the names of a collection's files currently being processed."""
+    return set(_in_progress_by_collection.get(collection_name, ()))
+
+
+# Dedicated threads for blocking MinIO calls, created on first use
+_io_executor: ThreadPoolExecutor | None = None
+
+
+def _run_blocking(func, *args):
+    """Run a blocking call on the watcher's I/O executor."""
+    global _io_executor
+    if _io_executor is None:
+        _io_executor = ThreadPoolExecutor(
+            max_workers=max(1, get_settings().watcher_io_workers),
+            thread_name_prefix="vault-watcher-io",
+        )
+    return asyncio.get_running_loop().run_in_executor(_io_executor, func, *args)
+
+
+def _remember_hash(
+    file_id: tuple[str, str], before: os.stat_result, after: os.stat_result, hash_sha256: str
+) -> None:
+    """Cache an uploaded file's hash if the file didn't change while it was read."""
+    changed = (before.st_size, before.st_mtime_ns) != (after.st_size, after.st_mtime_ns)
+    if changed or time.time_ns() - after.st_mtime_ns <= RACY_MTIME_NS:
+        _hash_cache.pop(file_id, None)
+        return
+    _hash_cache[file_id] = (after.st_size, after.st_mtime_ns, hash_sha256)
+    _hash_cache.move_to_end(file_id)
+    if len(_hash_cache) > HASH_CACHE_MAX_ENTRIES:
+        _hash_cache.popitem(last=False)
+
+
+async def _is_unchanged(
+    file_id: tuple[str, str], object_key: str, file_path: Path, st: os.stat_result
+) -> bool:
+    """
+    Check whether a file is already stored as is, so its upload can be skipped.
+
+    The database must have a ready object of the same size for it. Its hash is
+    then compared with the cached hash of the last upload when the file's size
+    and mtime still match that upload, and otherwise (e.g. after a restart)
+    with a fresh local hash, which is much cheaper than uploading again.
+    """
+    cached = _hash_cache.get(file_id)
+    if cached is not None and cached[:2] != (st.st_size, st.st_mtime_ns):
+        # Changed since it was last uploaded
+        _hash_cache.pop(file_id, None)
+        return False
+
+    async with get_session() as session:
+        ref = await ObjectRepository(session).get_ready_ref_by_collection_and_name(*file_id)
+    if ref is None or ref.object_key != object_key or ref.size_bytes != st.st_size:
+        _hash_cache.pop(file_id, None)
+        return False
+
+    if cached is not None:
+        if ref.hash_sha256 != cached[2]:
+            _hash_cache.pop(file_id, None)
+            return False
+        _hash_cache.move_to_end(file_id)
+        return True
+
+    hash_sha256, _ = await _run_blocking(compute_file_hash, file_path)
+    if hash_sha256 != ref.hash_sha256:
+        return False
+    _remember_hash(file_id, st, os.stat(file_path), hash_sha256)
+    return True
+
+
 @asynccontextmanager
 async def acquire_semaphore_with_timeout(timeout: float = SEMAPHORE_TIMEOUT):
     """
@@ -72,13 +212,10 @@ async def acquire_semaphore_with_timeout(timeout: float = SEMAPHORE_TIMEOUT):
         raise
 
 
-def should_ignore(path: Path) -> bool:
-    """Check if a file should be ignored by the watcher."""
-    name = path.name
+def should_ignore(name: str) -> bool:
+    """Check if a file name (basename) should be ignored by the watcher."""
     # Ignore hidden files and specific files
-    if name.startswith(".") or name in IGNORED_FILES:
-        return True
-    return False
+    return name[:1] == "." or name in IGNORED_FILES
 
 
 def parse_collection_path(file_path: Path) -> tuple[str, str] | None:
@@ -90,22 +227,20 @@ def parse_collection_path(file_path: Path) -> tuple[str, str] | None:
     Returns:
         Tuple of (collection_name, object_name) or None if invalid path
     """
-    settings = get_settings()
-    collections_root = settings.collections_root
-
-    try:
-        rel_path = file_path.relative_to(collections_root)
-        parts = rel_path.parts
-        if len(parts) != 2:
-            # Only handle files directly in collection folders (not nested)
-            return None
-        collection_name, object_name = parts
-        return collection_name, object_name
-    except ValueError:
+    prefix = _root_prefix()
+    path_str = str(file_path)
+    if not path_str.startswith(prefix):
+        return None
+    # Exactly one separator after the root, with a name on each side
+    start = len(prefix)
+    sep = path_str.find(os.sep, start)
+    if sep <= start or sep == len(path_str) - 1 or path_str.find(os.sep, sep + 1) >= 0:
+        # Only handle files directly in collection folders (not nested)
         return None
+    return path_str[start:sep], path_str[sep + 1 :]
 
 
-def parse_collection_dir(dir_path: Path) -> str | None:
+def parse_collection_dir(dir_path: Path | str) -> str | None:
     """
     Parse a directory path to extract collection name.
 
@@ -114,18 +249,15 @@ def parse_collection_dir(dir_path: Path) -> str | None:
     Returns:
         Collection name or None if not a direct child of collections root
     """
-    settings = get_settings()
-    collections_root = settings.collections_root
-
-    try:
-        rel_path = dir_path.relative_to(collections_root)
-        parts = rel_path.parts
-        if len(parts) != 1:
-            # Only handle direct children of collections root
-            return None
-        return parts[0]
-    except ValueError:
+    prefix = _root_prefix()
+    path_str = str(dir_path)
+    if not path_str.startswith(prefix):
+        return None
+    name = path_str[len(prefix) :]
+    if not name or os.sep in name:
+        # Only handle direct children of collections root
         return None
+    return name
 
 
 async def handle_directory_created(dir_path: Path) -> None:
@@ -142,18 +274,26 @@ async def handle_directory_created(dir_path: Path) -> None:
         logger.error(f"Failed to create collection {collection_name}: {e}", exc_info=True)
 
 
+def _read_key_file(key_file: Path) -> str | None:
+    """Read a .vault_key file (blocking), or None if it doesn't exist."""
+    try:
+        return key_file.read_text().strip()
+    except FileNotFoundError:
+        return None
+
+
 async def ensure_collection_exists(collection_name: str) -> None:
     """
     Ensure a collection exists in the database.
     If .vault_key exists, use that key. Otherwise generate a new one.
     """
-    settings = get_settings()
-    key_file = settings.collections_root / collection_name / ".vault_key"
+    if collection_name in _known_collections:
+        return
+
+    key_file = _root() / collection_name / ".vault_key"
 
     # Check if .vault_key already exists
-    existing_key = None
-    if key_file.exists():
-        existing_key = key_file.read_text().strip()
+    existing_key = await asyncio.to_thread(_read_key_file, key_file)
 
     async with get_session() as session:
         repo = CollectionRepository(session)
@@ -161,76 +301,202 @@ async def ensure_collection_exists(collection_name: str) -> None:
 
         # If api_key is not None, this is a new collection - write the key file
         if api_key is not None and existing_key is None:
-            key_file.write_text(api_key)
+            await asyncio.to_thread(key_file.write_text, api_key)
             logger.info(f"Created collection '{collection_name}' with API key in {key_file}")
         elif api_key is not None and existing_key is not None:
             logger.info(f"Created collection '{collection_name}' using existing .vault_key")
 
+    # Only cached once the session has committed without error
+    _known_collections.add(collection_name)
+
 
 async def handle_vault_key_modified(collection_name: str) -> None:
     """Handle .vault_key file modification - update the API key in database."""
-    settings = get_settings()
-    key_file = settings.collections_root / collection_name / ".vault_key"
+    key_file = _root() / collection_name / ".vault_key"
 
-    if not key_file.exists():
+    new_key = await asyncio.to_thread(_read_key_file, key_file)
+    if new_key is None:
         logger.warning(f".vault_key deleted for collection {collection_name}")
         return
-
-    new_key = key_file.read_text().strip()
     if not new_key:
         logger.warning(f".vault_key is empty for collection {collection_name}")
         return
 
+    # Verifications of the old key cached by the API are dropped on commit
     async with get_session() as session:
         repo = CollectionRepository(session)
         if await repo.update_api_key(collection_name, new_key):
             logger.info(f"Updated API key for collection '{collection_name}'")
 
 
-async def handle_file_created_or_modified(file_path: Path) -> None:
-    """Handle a file create or modify event."""
-    if should_ignore(file_path):
-        return
+def _split_vanished(rows: list[dict]) -> tuple[list[dict], list[dict]]:
+    """Split rows into those whose file still exists and those whose file is gone."""
+    prefix = _root_prefix()
+    present: list[dict] = []
+    vanished: list[dict] = []
+    for row in rows:
+        exists = os.path.exists(prefix + row["collection"] + os.sep + row["name"])
+        (present if exists else vanished).append(row)
+    return present, vanished
 
-    if not file_path.is_file():
-        return
 
+async def _register_objects(rows: list[dict]) -> None:
+    """Write uploaded objects to the database in one session, then release them."""
+    try:
+        # A delete event for a file still waiting here was dropped as "in
+        # progress", so files that are gone by now are deleted, not registered
+        present, vanished = await _run_blocking(_split_vanished, rows)
+        for row in vanished:
+            _hash_cache.pop((row["collection"], row["name"]), None)
+            await _run_blocking(delete_object, row["object_key"])
+
+        async with get_session() as session:
+            repo = ObjectRepository(session)
+            if present:
+                await repo.bulk_create_or_replace(present)
+            for row in vanished:
+                await repo.mark_deleted(row["collection"], row["name"])
+                logger.info(f"Object removed before registration: {row['object_key']}")
+        if len(present) == 1:
+            row = present[0]
+            logger.info(
+                f"Registered object: {row['object_key']} (hash: {row['hash_sha256'][:16]}...)"
+            )
+        elif present:
+            logger.info(f"Registered {len(present)} objects")
+        metrics.watcher_files_processed.inc(len(rows))
+    except Exception as e:
+        logger.error(f"Failed to register {len(rows)} objects: {e}", exc_info=True)
+        metrics.watcher_files_failed.inc(len(rows))
+    finally:
+        for row in rows:
+            _clear_in_progress(row["collection"], row["name"])
+
+
+class ObjectRegistrar:
+    """
+    Pipeline stage registering uploaded objects in the database.
+
+    Uploads hand their rows over and move on to the next file, while a single
+    background task writes whatever has queued up with multi-row upserts, so
+    uploads overlap with database writes and bursts share transactions.
+    Handed-over files stay marked in progress until their rows are written,
+    so sync checks keep waiting for them.
+
+    Started and stopped with the watcher; stop() writes everything still
+    queued, so it must run before the database is closed.
+    """
+
+    def __init__(self, max_batch: int = BULK_UPSERT_BATCH_SIZE):
+        self.max_batch = max_batch
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start the background writer on the loop (no-op if already running)."""
+        if self._task is not None and not self._task.done():
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=2 * self.max_batch)
+        self._task = loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Write all queued rows, then stop the background writer."""
+        if self._task is None:
+            return
+        if not self._task.done():
+            await self.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._queue = None
+
+    async def put(self, row: dict) -> None:
+        """Queue an object row, waiting while the queue is full (back-pressure)."""
+        if self._task is None:
+            raise RuntimeError("Object registrar is not running")
+        await self._queue.put(row)
+
+    async def join(self) -> None:
+        """Wait until every queued row has been written (or failed)."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def _run(self) -> None:
+        queue = self._queue
+        while True:
+            rows = [await queue.get()]
+            while len(rows) < self.max_batch and not queue.empty():
+                rows.append(queue.get_nowait())
+            try:
+                await _register_objects(rows)
+            finally:
+                for _ in rows:
+                    queue.task_done()
+
+
+# Global registrar instance
+_registrar: ObjectRegistrar | None = None
+
+
+def get_registrar() -> ObjectRegistrar:
+    """Get or create the global object registrar."""
+    global _registrar
+    if _registrar is None:
+        _registrar = ObjectRegistrar()
+    return _registrar
+
+
+async def handle_file_created_or_modified(file_path: Path) -> bool:
+    """
+    Handle a file create or modify event.
+
+    The file is uploaded here; its database row is written by the registrar
+    stage (see ObjectRegistrar).
+
+    Returns False if the file is already being processed, in which case the
+    event must be retried later so the new content is not lost.
+    """
+    if should_ignore(file_path.name):
+        return True
+
+    # Parse before touching the filesystem; paths outside collections cost no stat
     parsed = parse_collection_path(file_path)
     if parsed is None:
         logger.debug(f"Ignoring file outside collection structure: {file_path}")
-        return
+        return True
+
+    try:
+        if not stat.S_ISREG(os.stat(file_path).st_mode):
+            return True
+    except OSError:
+        return True
 
     collection_name, object_name = parsed
     object_key = f"{collection_name}/{object_name}"
-    path_str = str(file_path)
-    now = time.time()
-
-    # Debouncing: check if we should skip this event
-    async with _processing_lock:
-        # Check if file is currently being processed
-        if path_str in _files_in_progress:
-            started_at = _files_in_progress[path_str]
-            if now - started_at < PROCESSING_TIMEOUT:
-                logger.debug(f"Skipping {object_key}: already being processed")
-                return
-            else:
-                # Processing stuck, allow retry
-                logger.warning(f"Processing timeout for {object_key}, allowing retry")
-                del _files_in_progress[path_str]
-
-        # Check debounce window
-        if path_str in _last_event_time:
-            last_time = _last_event_time[path_str]
-            if now - last_time < DEBOUNCE_SECONDS:
-                logger.debug(f"Debouncing {object_key}: event too soon after last")
-                return
-
-        # Mark as in progress
-        _files_in_progress[path_str] = now
-        _last_event_time[path_str] = now
+    file_id = (collection_name, object_name)
+    now = time.monotonic()
+
+    # Check if file is currently being processed
+    started_at = _files_in_progress.get(file_id)
+    if started_at is not None:
+        if now - started_at < PROCESSING_TIMEOUT:
+            logger.debug(f"Deferring {object_key}: already being processed")
+            return False
+        else:
+            # Processing stuck, allow retry
+            logger.warning(f"Processing timeout for {object_key}, allowing retry")
+            _clear_in_progress(collection_name, object_name)
+
+    # Mark as in progress
+    _mark_in_progress(collection_name, object_name, now)
 
     logger.info(f"Processing file: {file_path} -> {object_key}")
     metrics.watcher_files_in_progress.inc()
+    handed_over = False
 
     try:
         # Use semaphore with timeout to limit concurrent processing
@@ -239,28 +505,32 @@ async def handle_file_created_or_modified(file_path: Path) -> None:
                 # Ensure collection exists
                 await ensure_collection_exists(collection_name)
 
-                # Compute hash
-                hash_sha256, size_bytes = compute_file_hash(file_path)
-                logger.debug(f"Computed hash for {object_key}: {hash_sha256}")
+                # Skip files that haven't changed since they were last uploaded. Stat
+                # again rather than reuse the first stat: the file may have
+                # changed while this task waited for the semaphore.
+                st_before = os.stat(file_path)
+                if await _is_unchanged(file_id, object_key, file_path, st_before):
+                    logger.debug(f"Skipping {object_key}: unchanged since last upload")
+                    return True
 
-                # Upload to MinIO (this can raise CircuitBreakerError)
-                upload_file(object_key, file_path)
-                logger.debug(f"Uploaded {object_key} to MinIO")
+                # Upload to MinIO, hashing in the same read pass (can raise CircuitBreakerError).
+                # Runs in a worker thread so hashing and network I/O don't block the loop
+                hash_sha256, size_bytes = await _run_blocking(upload_file, object_key, file_path)
+                logger.debug(f"Uploaded {object_key} to MinIO (hash: {hash_sha256})")
+
+                _remember_hash(file_id, st_before, os.stat(file_path), hash_sha256)
 
                 # Update database (only after successful MinIO upload)
-                async with get_session() as session:
-                    repo = ObjectRepository(session)
-                    await repo.create_or_replace(
-                        collection=collection_name,
-                        name=object_name,
-                        object_key=object_key,
-                        hash_sha256=hash_sha256,
-                        size_bytes=size_bytes,
-                    )
-                    logger.info(f"Registered object: {object_key} (hash: {hash_sha256[:16]}...)")
-
-                # Record success
-                metrics.watcher_files_processed.inc()
+                await get_registrar().put(
+                    {
+                        "collection": collection_name,
+                        "name": object_name,
+                        "object_key": object_key,
+                        "hash_sha256": hash_sha256,
+                        "size_bytes": size_bytes,
+                    }
+                )
+                handed_over = True
 
             except CircuitBreakerError as e:
                 # MinIO circuit breaker is open - don't fail, retry later
@@ -277,51 +547,47 @@ async def handle_file_created_or_modified(file_path: Path) -> None:
 
     finally:
         metrics.watcher_files_in_progress.dec()
-        # Remove from in-progress
-        async with _processing_lock:
-            _files_in_progress.pop(path_str, None)
+        # Remove from in-progress (handed-over files are removed once registered)
+        if not handed_over:
+            _clear_in_progress(collection_name, object_name)
+    return True
 
 
-async def handle_file_deleted(file_path: Path) -> None:
-    """Handle a file delete event."""
-    if should_ignore(file_path):
-        return
+async def handle_file_deleted(file_path: Path) -> bool:
+    """
+    Handle a file delete event.
+
+    Returns False if the file is still being processed for an earlier event,
+    in which case the deletion must be retried later.
+    """
+    if should_ignore(file_path.name):
+        return True
 
     parsed = parse_collection_path(file_path)
     if parsed is None:
-        return
+        return True
 
     collection_name, object_name = parsed
     object_key = f"{collection_name}/{object_name}"
-    path_str = str(file_path)
-    now = time.time()
+    file_id = (collection_name, object_name)
 
     # Check if file actually exists - PollingObserver can report false deletions
-    if file_path.exists():
+    if os.path.exists(file_path):
         logger.debug(f"Ignoring false deletion for {object_key}: file still exists")
-        return
-
-    # Debouncing for deletions
-    async with _processing_lock:
-        # If file is being processed for creation, skip deletion
-        if path_str in _files_in_progress:
-            logger.debug(f"Skipping deletion {object_key}: file is being processed")
-            return
+        return True
 
-        # Check debounce window
-        if path_str in _last_event_time:
-            last_time = _last_event_time[path_str]
-            if now - last_time < DEBOUNCE_SECONDS:
-                logger.debug(f"Debouncing deletion {object_key}: event too soon")
-                return
+    # A file still being uploaded or registered is deleted once that finishes
+    if file_id in _files_in_progress:
+        logger.debug(f"Deferring deletion {object_key}: file is being processed")
+        return False
 
-        _last_event_time[path_str] = now
+    _hash_cache.pop(file_id, None)
 
     logger.info(f"Processing deletion: {object_key}")
 
     try:
-        # Delete from MinIO
-        delete_object(object_key)
+        # Delete from MinIO (blocking call, run off the event loop)
+        await _run_blocking(delete_object, object_key)
         logger.debug(f"Deleted {object_key} from MinIO")
 
         # Mark as deleted in database
@@ -332,6 +598,7 @@ async def handle_file_deleted(file_path: Path) -> None:
 
     except Exception as e:
         logger.error(f"Failed to process deletion {file_path}: {e}", exc_info=True)
+    return True
 
 
 class VaultEventHandler(FileSystemEventHandler):
@@ -340,42 +607,114 @@ class VaultEventHandler(FileSystemEventHandler):
     def __init__(self, loop: asyncio.AbstractEventLoop):
         super().__init__()
         self.loop = loop
+        # File events are coalesced per path: each one (re)arms the path's timer
+        # and records whether its latest event was a deletion. Only touched on
+        # the loop thread.
+        self._pending: dict[str, asyncio.TimerHandle] = {}
+        self._pending_deleted: dict[str, bool] = {}
+        # Settled paths waiting for a task slot, in arrival order, and for each
+        # queued path whether it was deleted (also used to skip duplicates)
+        self._ready: deque[str] = deque()
+        self._ready_deleted: dict[str, bool] = {}
+        self._tasks: set[asyncio.Task] = set()
 
     def _run_async(self, coro):
         """Schedule a coroutine to run in the event loop."""
         asyncio.run_coroutine_threadsafe(coro, self.loop)
 
+    def _schedule(self, path: str, deleted: bool = False) -> None:
+        """Process a file event once the path's events have been quiet for a while."""
+        self.loop.call_soon_threadsafe(self._restart_timer, path, deleted)
+
+    def _restart_timer(self, path_str: str, deleted: bool) -> None:
+        """(Re)arm the quiescence timer for a path. Runs on the loop thread."""
+        handle = self._pending.get(path_str)
+        if handle is not None:
+            handle.cancel()
+        self._pending_deleted[path_str] = deleted
+        self._pending[path_str] = self.loop.call_later(QUIESCENCE_SECONDS, self._fire, path_str)
+
+    def _fire(self, path_str: str) -> None:
+        """Queue a path whose events have settled. Runs on the loop thread."""
+        self._pending.pop(path_str, None)
+        deleted = self._pending_deleted.pop(path_str)
+        if path_str not in self._ready_deleted:
+            self._ready.append(path_str)
+        # A queued path is handled according to its latest event
+        self._ready_deleted[path_str] = deleted
+        self._start_ready()
+
+    def _start_ready(self) -> None:
+        """Start queued paths while task slots are free. Runs on the loop thread."""
+        while self._ready and len(self._tasks) < MAX_ACTIVE_FILE_TASKS:
+            path_str = self._ready.popleft()
+            deleted = self._ready_deleted.pop(path_str)
+            if deleted:
+                coro = handle_file_deleted(Path(path_str))
+            else:
+                coro = handle_file_created_or_modified(Path(path_str))
+            task = self.loop.create_task(coro)
+            self._tasks.add(task)
+            task.add_done_callback(partial(self._task_done, path_str, deleted))
+        metrics.watcher_files_queued.set(len(self._ready))
+
+    def _task_done(self, path_str: str, deleted: bool, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if task.cancelled():
+            pass
+        elif task.exception() is not None:
+            logger.error(f"Unhandled error processing {path_str}", exc_info=task.exception())
+        elif task.result() is False and not (
+            path_str in self._pending or path_str in self._ready_deleted
+        ):
+            # The path was busy with an earlier event: retry after another quiet
+            # period, unless a newer event for it is already pending
+            self._restart_timer(path_str, deleted)
+        self._start_ready()
+
+    # Ignored files are filtered here, on the observer thread, so editor and
+    # OS noise never builds a Path or wakes up the event loop.
+
     def on_created(self, event: FileSystemEvent) -> None:
         """Handle file/directory creation events."""
         if event.is_directory:
             self._run_async(handle_directory_created(Path(event.src_path)))
             return
-        self._run_async(handle_file_created_or_modified(Path(event.src_path)))
+        if should_ignore(os.path.basename(event.src_path)):
+            return
+        self._schedule(event.src_path)
 
     def on_modified(self, event: FileSystemEvent) -> None:
         """Handle file modification events."""
         if event.is_directory:
             return
-        path = Path(event.src_path)
+        path_str = event.src_path
+        name = os.path.basename(path_str)
         # Handle .vault_key modifications
-        if path.name == ".vault_key":
-            collection_name = parse_collection_dir(path.parent)
+        if name == ".vault_key":
+            collection_name = parse_collection_dir(os.path.dirname(path_str))
             if collection_name:
                 self._run_async(handle_vault_key_modified(collection_name))
             return
-        self._run_async(handle_file_created_or_modified(path))
+        if should_ignore(name):
+            return
+        self._schedule(path_str)
 
     def on_deleted(self, event: FileSystemEvent) -> None:
         """Handle file deletion events."""
         if event.is_directory:
             return
-        self._run_async(handle_file_deleted(Path(event.src_path)))
+        if should_ignore(os.path.basename(event.src_path)):
+            return
+        self._schedule(event.src_path, deleted=True)
 
     def on_moved(self, event: FileSystemEvent) -> None:
         """Handle file move events (treat as delete + create)."""
         if event.is_directory:
             return
         # Handle the old path as deleted
-        self._run_async(handle_file_deleted(Path(event.src_path)))
-        # Handle the new path as created
-        self._run_async(handle_file_created_or_modified(Path(event.dest_path)))
+        if not should_ignore(os.path.basename(event.src_path)):
+            self._schedule(event.src_path, deleted=True)
+        # Handle the new path as created (e.g. an editor's temp file renamed into place)
+        if not should_ignore(os.path.basename(event.dest_path)):
+            self._schedule(event.dest_path)
@@ -2,9 +2,16 @@
 
 import asyncio
 import logging
+import os
+import shutil
+import tempfile
+import threading
 import time
 from pathlib import Path
 
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+from watchdog.observers import Observer
+from watchdog.observers.api import BaseObserver
 from watchdog.observers.polling import PollingObserver
 
 from vault.config import get_settings
@@ -12,12 +19,88 @@ from vault.monitoring.metrics import metrics
 from vault.watcher.handler import (
     VaultEventHandler,
     ensure_collection_exists,
+    forget_known_collections,
+    get_registrar,
     handle_file_created_or_modified,
 )
 
 logger = logging.getLogger(__name__)
 
 
+# Seconds the "auto" watcher backend waits for the native observer to report
+# a probe file before falling back to polling
+NATIVE_PROBE_TIMEOUT = 1.0
+
+
+class _NotifyOnDeath:
+    """Observer mixin that calls on_death if its thread exits without stop()."""
+
+    def __init__(self, on_death, **kwargs):
+        super().__init__(**kwargs)
+        self._on_death = on_death
+
+    def run(self) -> None:
+        try:
+            super().run()
+        finally:
+            if self.should_keep_running():
+                self._on_death(self)
+
+
+class _NotifyingPollingObserver(_NotifyOnDeath, PollingObserver):
+    """PollingObserver that calls on_death if its thread exits without stop()."""
+
+
+class _NotifyingObserver(_NotifyOnDeath, Observer):
+    """Native (inotify, FSEvents, ...) counterpart of _NotifyingPollingObserver."""
+
+
+class _ProbeHandler(FileSystemEventHandler):
+    def __init__(self):
+        super().__init__()
+        self.seen = threading.Event()
+
+    def on_any_event(self, event: FileSystemEvent) -> None:
+        self.seen.set()
+
+
+# Result of the native-observer self-test, run once per process
+_native_events_work: bool | None = None
+
+
+def _native_events_work_in(root: Path) -> bool:
+    """
+    Check that a native observer reports a file created under root.
+
+    The probe runs in a hidden temporary directory, watched by its own observer,
+    so it never reaches the collection event handler.
+    """
+    global _native_events_work
+    if _native_events_work is not None:
+        return _native_events_work
+
+    probe_dir = None
+    observer = Observer(timeout=NATIVE_PROBE_TIMEOUT)
+    handler = _ProbeHandler()
+    try:
+        probe_dir = tempfile.mkdtemp(prefix=".vault-watch-probe-", dir=root)
+        observer.schedule(handler, probe_dir, recursive=False)
+        observer.start()
+        try:
+            Path(probe_dir, "probe").touch()
+            _native_events_work = handler.seen.wait(NATIVE_PROBE_TIMEOUT)
+        finally:
+            observer.stop()
+            observer.join(timeout=5)
+    except OSError as e:
+        logger.warning(f"Native filesystem observer unavailable: {e}")
+        _native_events_work = False
+    finally:
+        if probe_dir is not None:
+            shutil.rmtree(probe_dir, ignore_errors=True)
+    return _native_events_work
+
+
 class CollectionWatcher:
     """
     Watches the collections directory for file changes.
@@ -27,11 +110,14 @@ class CollectionWatcher:
     """
 
     def __init__(self):
-        self.observer: PollingObserver | None = None
+        self.observer: BaseObserver | None = None
         self._running = False
+        # time.monotonic() of the last event; a plain float read without locking
         self._last_event_time: float | None = None
         self._event_loop: asyncio.AbstractEventLoop | None = None
         self._restart_count = 0
+        # Set from the observer thread when it dies, so monitoring reacts at once
+        self.observer_died = asyncio.Event()
 
     async def scan_existing_files(self) -> None:
         """
@@ -51,19 +137,33 @@ class CollectionWatcher:
 
         logger.info(f"Scanning existing files in {collections_root}")
 
-        for collection_dir in collections_root.iterdir():
-            if not collection_dir.is_dir():
-                continue
+        # scandir reports entry types from the directory listing itself, so
+        # only symlinks cost an extra stat
+        with os.scandir(collections_root) as entries:
+            collection_dirs = [entry.path for entry in entries if entry.is_dir()]
 
-            collection_name = collection_dir.name
+        for collection_dir in collection_dirs:
+            collection_name = os.path.basename(collection_dir)
             logger.info(f"Scanning collection: {collection_name}")
 
             # Ensure collection exists (creates .vault_key if new)
             await ensure_collection_exists(collection_name)
 
-            for file_path in collection_dir.iterdir():
-                if file_path.is_file():
-                    await handle_file_created_or_modified(file_path)
+            with os.scandir(collection_dir) as entries:
+                # A few workers share one iterator, so uploads of different files
+                # overlap without a task per file. The registrar stage writes
+                # the uploaded objects to the database in batches.
+                files = (Path(entry.path) for entry in entries if entry.is_file())
+
+                async def worker() -> None:
+                    for file_path in files:
+                        await handle_file_created_or_modified(file_path)
+
+                await asyncio.gather(
+                    *(worker() for _ in range(max(1, settings.watcher_scan_concurrency)))
+                )
+
+        await get_registrar().join()
 
         logger.info("Initial scan complete")
 
@@ -85,29 +185,77 @@ class CollectionWatcher:
         # Ensure the directory exists
         collections_root.mkdir(parents=True, exist_ok=True)
 
+        # Collections may have changed while no watcher was running
+        forget_known_collections()
+
+        # Uploaded objects are written to the database by the registrar
+        get_registrar().start(loop)
+
         # Create the event handler with event tracking
         handler = VaultEventHandler(loop)
 
-        # Create and configure the observer (polling for Docker volume compatibility)
-        self.observer = PollingObserver(timeout=5)
-        self.observer.schedule(handler, str(collections_root), recursive=True)
-
-        # Start watching
-        self.observer.start()
+        # Create, configure and start the observer
+        self.observer_died.clear()
+        self.observer = self._start_observer(handler, settings.watcher_backend, collections_root)
         self._running = True
-        self._last_event_time = time.time()
+        self._last_event_time = time.monotonic()
 
         logger.info(f"Started watching: {collections_root}")
 
+    def _start_observer(
+        self, handler: VaultEventHandler, backend: str, collections_root: Path
+    ) -> BaseObserver:
+        """
+        Start an observer of the configured backend on the collections root.
+
+        Polling is the default since it works on Docker volumes, where changes
+        made on the host raise no inotify events. A native observer that cannot
+        be started (e.g. out of inotify watches) falls back to polling.
+        """
+        if backend == "native" or (backend == "auto" and _native_events_work_in(collections_root)):
+            observer = _NotifyingObserver(self._notify_observer_died, timeout=5)
+            try:
+                observer.schedule(handler, str(collections_root), recursive=True)
+                observer.start()
+                logger.info("Using native filesystem observer")
+                return observer
+            except OSError as e:
+                logger.warning(f"Native filesystem observer failed, falling back to polling: {e}")
+                observer.unschedule_all()
+
+        observer = _NotifyingPollingObserver(self._notify_observer_died, timeout=5)
+        observer.schedule(handler, str(collections_root), recursive=True)
+        observer.start()
+        return observer
+
+    def _notify_observer_died(self, observer: BaseObserver) -> None:
+        """Signal observer_died on the event loop (called from the observer thread)."""
+
+        def mark_dead() -> None:
+            # Ignore observers that were stopped or replaced in the meantime
+            if self.observer is observer:
+                self.observer_died.set()
+
+        try:
+            self._event_loop.call_soon_threadsafe(mark_dead)
+        except RuntimeError:
+            pass  # Event loop already closed
+
     def stop(self) -> None:
         """Stop the filesystem watcher."""
         if self.observer is not None:
             self.observer.stop()
             self.observer.join(timeout=5)
             self.observer = None
+            self.observer_died.clear()
             self._running = False
             logger.info("Watcher stopped")
 
+    async def shutdown(self) -> None:
+        """Stop the watcher and register uploaded objects still queued."""
+        self.stop()
+        await get_registrar().stop()
+
     def restart(self) -> None:
         """Restart the watcher (e.g., after thread death)."""
         if self._event_loop is None:
@@ -123,7 +271,7 @@ class CollectionWatcher:
 
     def record_event(self) -> None:
         """Record that an event was processed (for health monitoring)."""
-        self._last_event_time = time.time()
+        self._last_event_time = time.monotonic()
 
     @property
     def is_running(self) -> bool:
@@ -148,14 +296,15 @@ class CollectionWatcher:
         """Get seconds since last event, or None if no events yet."""
         if self._last_event_time is None:
             return None
-        return time.time() - self._last_event_time
+        return time.monotonic() - self._last_event_time
 
     def get_health_status(self) -> dict:
         """Get watcher health status for monitoring."""
+        age = self.last_event_age
         return {
             "running": self._running,
             "observer_alive": self.observer_alive,
-            "last_event_age_s": round(self.last_event_age, 1) if self.last_event_age else None,
+            "last_event_age_s": round(age, 1) if age else None,
             "restart_count": self._restart_count,
         }
 
@@ -0,0 +1,89 @@
+"""Shared fixtures for the Vault test suite."""
+
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+
+# Settings are read once at import, so point them at a scratch directory before
+# anything imports vault.config
+_TMP_DIR = tempfile.mkdtemp(prefix="vault-tests-")
+os.environ["VAULT_DATABASE_URL"] = f"sqlite+aiosqlite:///{_TMP_DIR}/vault.db"
+os.environ["VAULT_COLLECTIONS_ROOT"] = os.path.join(_TMP_DIR, "collections")
+
+import pytest  # noqa: E402
+
+from vault.api import auth  # noqa: E402
+from vault.config import get_settings  # noqa: E402
+from vault.db.session import close_db, init_db  # noqa: E402
+from vault.minio_client.client import compute_file_hash  # noqa: E402
+from vault.watcher import handler  # noqa: E402
+
+
+@pytest.fixture
+async def db():
+    """Initialized database; the engine is disposed after each test's event loop."""
+    await init_db()
+    yield
+    await close_db()
+
+
+@pytest.fixture
+def verified_key_cache(monkeypatch):
+    """Fresh verified-key cache, so tests don't see each other's entries."""
+    cache = auth.VerifiedKeyCache()
+    monkeypatch.setattr(auth, "_verified_key_cache", cache)
+    monkeypatch.setattr(auth, "_inflight_verifications", {})
+    return cache
+
+
+@pytest.fixture
+def collection(request) -> Path:
+    """An empty collection directory named after the test."""
+    path = get_settings().collections_root / request.node.name.replace("[", "-").strip("]")
+    path.mkdir(parents=True)
+    return path
+
+
+class FakeMinio:
+    """Records the watcher's MinIO uploads and deletes."""
+
+    def __init__(self):
+        self.uploads: list[str] = []
+        self.deletes: list[str] = []
+
+    def upload_file(self, object_key: str, file_path: Path) -> tuple[str, int]:
+        self.uploads.append(object_key)
+        return compute_file_hash(file_path)
+
+    def delete_object(self, object_key: str) -> bool:
+        self.deletes.append(object_key)
+        return True
+
+
+@pytest.fixture
+def minio(monkeypatch) -> FakeMinio:
+    """Replace the watcher's MinIO calls with a recorder."""
+    fake = FakeMinio()
+    monkeypatch.setattr(handler, "upload_file", fake.upload_file)
+    monkeypatch.setattr(handler, "delete_object", fake.delete_object)
+    return fake
+
+
+@pytest.fixture(autouse=True)
+def watcher_state(monkeypatch):
+    """Reset the watcher's module-level bookkeeping between tests."""
+    handler._files_in_progress.clear()
+    handler._in_progress_by_collection.clear()
+    handler._hash_cache.clear()
+    handler.forget_known_collections()
+    monkeypatch.setattr(handler, "_registrar", None)
+
+
+@pytest.fixture
+async def registrar(db):
+    """The watcher's object registrar, running for the duration of the test."""
+    registrar = handler.get_registrar()
+    registrar.start(asyncio.get_running_loop())
+    yield registrar
+    await registrar.stop()
@@ -0,0 +1,108 @@
+"""Tests for per-collection admission control."""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+
+from vault.api import admission
+from vault.api.admission import AdmissionDep, CollectionAdmission
+from vault.api.auth import verify_collection_key
+from vault.api.responses import AdmittedStreamingResponse
+
+
+@pytest.fixture
+def controller(monkeypatch) -> CollectionAdmission:
+    """Admission controller with one slot per collection and a short timeout."""
+    controller = CollectionAdmission(max_concurrent=1, timeout=0.05)
+    monkeypatch.setattr(admission, "_collection_admission", controller)
+    return controller
+
+
+class TestCollectionAdmission:
+    async def test_full_collection_rejects_after_timeout(self, controller):
+        await controller.acquire("cohort")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await controller.acquire("cohort")
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers == {"Retry-After": "1"}
+        assert controller.get_stats()["rejected"] == 1
+
+    async def test_collections_are_limited_separately(self, controller):
+        await controller.acquire("cohort")
+
+        await controller.acquire("other")
+        assert controller.get_stats()["in_flight"] == {"cohort": 1, "other": 1}
+
+    async def test_release_frees_the_slot_once(self, controller):
+        release = await controller.acquire("cohort")
+
+        release()
+        release()
+        assert controller.get_stats()["in_flight"] == {}
+        await controller.acquire("cohort")
+        with pytest.raises(HTTPException):
+            await controller.acquire("cohort")
+
+
+class StreamingApp:
+    """App with one admitted streaming endpoint, recording in-flight slots per chunk."""
+
+    def __init__(self, controller: CollectionAdmission):
+        self.in_flight_while_streaming: list[dict] = []
+        self.fail_mid_stream = False
+        self.app = FastAPI()
+        self.app.dependency_overrides[verify_collection_key] = lambda collection: collection
+        self.app.get("/collections/{collection}/stream")(self.stream)
+        self.controller = controller
+
+    async def body(self):
+        for chunk in (b"first", b"second"):
+            self.in_flight_while_streaming.append(self.controller.get_stats()["in_flight"])
+            await asyncio.sleep(0)
+            if self.fail_mid_stream:
+                raise RuntimeError("storage went away")
+            yield chunk
+
+    async def stream(self, collection: str, release_slot: AdmissionDep):
+        return AdmittedStreamingResponse(self.body(), release_slot)
+
+    def client(self) -> httpx.AsyncClient:
+        transport = httpx.ASGITransport(app=self.app, raise_app_exceptions=False)
+        return httpx.AsyncClient(transport=transport, base_url="http://vault")
+
+
+class TestAdmittedStreaming:
+    async def test_slot_is_held_until_body_is_sent(self, controller):
+        app = StreamingApp(controller)
+
+        async with app.client() as client:
+            response = await client.get("/collections/cohort/stream")
+
+        assert response.content == b"firstsecond"
+        assert app.in_flight_while_streaming == [{"cohort": 1}] * 2
+        assert controller.get_stats()["in_flight"] == {}
+
+    async def test_slot_is_released_when_body_fails(self, controller):
+        app = StreamingApp(controller)
+        app.fail_mid_stream = True
+
+        async with app.client() as client:
+            await client.get("/collections/cohort/stream")
+
+        assert controller.get_stats()["in_flight"] == {}
+
+    async def test_request_is_rejected_while_slot_is_held(self, controller):
+        app = StreamingApp(controller)
+        release = await controller.acquire("cohort")
+
+        async with app.client() as client:
+            response = await client.get("/collections/cohort/stream")
+            assert response.status_code == 503
+            assert response.headers["Retry-After"] == "1"
+
+            release()
+            response = await client.get("/collections/cohort/stream")
+            assert response.status_code == 200
@@ -0,0 +1,229 @@
+"""Tests for API key verification and auth rate limiting."""
+
+import asyncio
+
+import pytest
+
+from vault.api import auth
+from vault.api.auth import AuthRateLimiter, RateLimitConfig, VerifiedKeyCache
+from vault.db.repository import CollectionRepository
+from vault.db.session import get_session
+
+
+@pytest.fixture
+def clock():
+    """Mutable monotonic time, in seconds."""
+    return [1000.0]
+
+
+@pytest.fixture
+def limiter(monkeypatch, clock):
+    """Rate limiter allowing 5 failures per 60s, on the test clock."""
+    limiter = AuthRateLimiter(
+        RateLimitConfig(max_failures=5, window_seconds=60.0, block_seconds=300.0)
+    )
+    monkeypatch.setattr(limiter, "_now", lambda: clock[0])
+    return limiter
+
+
+async def fail(limiter: AuthRateLimiter, times: int) -> list[bool]:
+    return [await limiter.record_failure("10.0.0.1", "cohort") for _ in range(times)]
+
+
+class TestAuthRateLimiter:
+    async def test_blocks_on_max_failures(self, limiter):
+        assert await fail(limiter, 5) == [False, False, False, False, True]
+
+        blocked, remaining = await limiter.is_blocked("10.0.0.1", "cohort")
+        assert blocked
+        assert remaining == pytest.approx(300.0)
+
+    async def test_block_is_per_ip_and_collection(self, limiter):
+        await fail(limiter, 5)
+
+        assert await limiter.is_blocked("10.0.0.2", "cohort") == (False, 0)
+        assert await limiter.is_blocked("10.0.0.1", "other") == (False, 0)
+
+    async def test_tokens_refill_over_window(self, limiter, clock):
+        await fail(limiter, 4)
+
+        # One token comes back every window / max_failures seconds
+        clock[0] += 12.0
+        assert await fail(limiter, 2) == [False, True]
+
+    async def test_full_refill_forgets_failures(self, limiter, clock):
+        await fail(limiter, 4)
+
+        clock[0] += 60.0
+        assert await fail(limiter, 4) == [False] * 4
+
+    async def test_block_expires(self, limiter, clock):
+        await fail(limiter, 5)
+
+        clock[0] += 300.0
+        assert await limiter.is_blocked("10.0.0.1", "cohort") == (False, 0)
+        # The bucket was dropped with the block: a full burst is allowed again
+        assert await fail(limiter, 4) == [False] * 4
+
+    async def test_success_clears_failures(self, limiter):
+        await fail(limiter, 4)
+
+        await limiter.record_success("10.0.0.1", "cohort")
+        assert await fail(limiter, 4) == [False] * 4
+
+    async def test_purge_drops_refilled_and_expired(self, limiter, clock):
+        await fail(limiter, 5)
+        await limiter.record_failure("10.0.0.2", "cohort")
+
+        clock[0] += 300.0
+        assert await limiter.purge_expired() == 2
+        assert limiter.get_stats()["tracked_keys"] == 0
+
+
+class SlowVerification:
+    """Stand-in for CollectionRepository.verify_api_key, blocked until released."""
+
+    def __init__(self, result: bool = True):
+        self.result = result
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self, name: str, api_key: str) -> bool:
+        self.calls += 1
+        await self.release.wait()
+        return self.result
+
+
+@pytest.fixture
+def verification(monkeypatch, verified_key_cache) -> SlowVerification:
+    slow = SlowVerification()
+    monkeypatch.setattr(CollectionRepository, "verify_api_key", slow)
+    return slow
+
+
+def verify(key: str = "secret") -> asyncio.Task:
+    digest = VerifiedKeyCache.key_digest(key)
+    return asyncio.create_task(auth._verify_api_key_once(None, "cohort", key, digest))
+
+
+class TestSingleFlightVerification:
+    async def test_concurrent_checks_share_one_query(self, verification):
+        tasks = [verify() for _ in range(3)]
+        await asyncio.sleep(0)
+
+        verification.release.set()
+        assert await asyncio.gather(*tasks) == [True, True, True]
+        assert verification.calls == 1
+
+    async def test_different_keys_are_not_coalesced(self, verification):
+        tasks = [verify("a"), verify("b")]
+        await asyncio.sleep(0)
+
+        verification.release.set()
+        await asyncio.gather(*tasks)
+        assert verification.calls == 2
+
+    async def test_cancelled_leader_does_not_cancel_waiters(self, verification):
+        leader = verify()
+        await asyncio.sleep(0)
+        waiter = verify()
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        verification.release.set()
+
+        assert await waiter is True
+        assert leader.cancelled()
+        # The waiter ran its own query once the leader was gone
+        assert verification.calls == 2
+
+    async def test_cancelled_waiter_is_cancelled(self, verification):
+        leader = verify()
+        await asyncio.sleep(0)
+        waiter = verify()
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        verification.release.set()
+        assert await leader is True
+        assert verification.calls == 1
+
+    async def test_only_successes_are_cached(self, verification, verified_key_cache):
+        verification.result = False
+        verification.release.set()
+
+        assert await verify() is False
+        assert not verified_key_cache.contains("cohort", VerifiedKeyCache.key_digest("secret"))
+
+
+class TestVerifiedKeyCache:
+    def test_contains_matches_digest(self):
+        cache = VerifiedKeyCache()
+        cache.add("cohort", VerifiedKeyCache.key_digest("secret"), cache.generation("cohort"))
+
+        assert cache.contains("cohort", VerifiedKeyCache.key_digest("secret"))
+        assert not cache.contains("cohort", VerifiedKeyCache.key_digest("other"))
+        assert not cache.contains("other", VerifiedKeyCache.key_digest("secret"))
+
+    def test_entries_expire(self):
+        cache = VerifiedKeyCache(ttl_seconds=0.0)
+        cache.add("cohort", VerifiedKeyCache.key_digest("secret"), 0)
+
+        assert not cache.contains("cohort", VerifiedKeyCache.key_digest("secret"))
+
+    def test_add_after_invalidate_is_skipped(self):
+        # A verification that started before a key rotation must not re-cache the old key
+        cache = VerifiedKeyCache()
+        generation = cache.generation("cohort")
+        cache.invalidate("cohort")
+        cache.add("cohort", VerifiedKeyCache.key_digest("old"), generation)
+
+        assert not cache.contains("cohort", VerifiedKeyCache.key_digest("old"))
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            lambda repo, name: repo.deactivate(name),
+            lambda repo, name: repo.rotate_api_key(name),
+            lambda repo, name: repo.update_api_key(name, "new"),
+        ],
+        ids=["deactivate", "rotate_api_key", "update_api_key"],
+    )
+    async def test_committed_key_change_invalidates(
+        self, db, verified_key_cache, collection, change
+    ):
+        name = collection.name
+        async with get_session() as session:
+            await CollectionRepository(session).get_or_create(name, api_key="old")
+        digest = VerifiedKeyCache.key_digest("old")
+        async with get_session() as session:
+            assert await auth._verify_api_key_once(session, name, "old", digest)
+        assert verified_key_cache.contains(name, digest)
+
+        async with get_session() as session:
+            await change(CollectionRepository(session), name)
+            # Not before the change is visible to other sessions
+            assert verified_key_cache.contains(name, digest)
+
+        assert not verified_key_cache.contains(name, digest)
+        async with get_session() as session:
+            assert not await auth._verify_api_key_once(session, name, "old", digest)
+
+    async def test_rolled_back_key_change_keeps_cache(self, db, verified_key_cache, collection):
+        name = collection.name
+        async with get_session() as session:
+            await CollectionRepository(session).get_or_create(name, api_key="old")
+        digest = VerifiedKeyCache.key_digest("old")
+        async with get_session() as session:
+            assert await auth._verify_api_key_once(session, name, "old", digest)
+
+        with pytest.raises(RuntimeError):
+            async with get_session() as session:
+                await CollectionRepository(session).deactivate(name)
+                raise RuntimeError("abort")
+
+        assert verified_key_cache.contains(name, digest)
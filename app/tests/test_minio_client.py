@@ -0,0 +1,22 @@
+"""Tests for the MinIO client wrapper."""
+
+import pytest
+from minio.helpers import get_part_info
+
+from vault.minio_client.client import CHUNK_SIZE, MAX_MULTIPART_COUNT, _part_size
+
+GiB = 1024 * 1024 * 1024
+
+
+class TestPartSize:
+    @pytest.mark.parametrize("size", [0, 1, 5 * GiB, 78 * GiB])
+    def test_chunk_size_while_it_fits(self, size):
+        assert _part_size(size) == CHUNK_SIZE
+
+    @pytest.mark.parametrize("size", [80 * GiB, 100 * GiB, 1024 * GiB, 5 * 1024 * GiB])
+    def test_large_files_fit_in_max_parts(self, size):
+        part_size, part_count = get_part_info(size, _part_size(size))
+
+        assert part_size % (1024 * 1024) == 0
+        assert part_count <= MAX_MULTIPART_COUNT
+        assert part_size * part_count >= size
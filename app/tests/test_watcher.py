@@ -0,0 +1,263 @@
+"""Tests for the filesystem watcher's event handling and object registration."""
+
+import asyncio
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from vault.db.repository import ObjectRepository
+from vault.db.session import get_session
+from vault.watcher import handler, watcher
+from vault.watcher.handler import VaultEventHandler
+
+
+async def ready_object(collection: Path, name: str):
+    """The READY database row of an object, or None."""
+    async with get_session() as session:
+        repo = ObjectRepository(session)
+        return await repo.get_ready_ref_by_collection_and_name(collection.name, name)
+
+
+def write(path: Path, content: str, age: float = 0.0) -> Path:
+    """Write a file, optionally with an mtime `age` seconds in the past."""
+    path.write_text(content)
+    if age:
+        st = path.stat()
+        os.utime(path, (st.st_atime - age, st.st_mtime - age))
+    return path
+
+
+class TestObjectRegistrar:
+    async def test_uploaded_files_are_registered(self, registrar, minio, collection):
+        paths = [write(collection / f"file{i}.txt", f"data {i}") for i in range(20)]
+
+        for path in paths:
+            assert await handler.handle_file_created_or_modified(path)
+        await registrar.join()
+
+        assert len(minio.uploads) == 20
+        for path in paths:
+            obj = await ready_object(collection, path.name)
+            assert obj.hash_sha256 == handler.compute_file_hash(path)[0]
+        assert not handler.get_in_progress_names(collection.name)
+
+    async def test_files_stay_in_progress_until_registered(self, registrar, minio, collection):
+        path = write(collection / "file.txt", "data")
+
+        await handler.handle_file_created_or_modified(path)
+        assert handler.get_in_progress_names(collection.name) == {"file.txt"}
+
+        await registrar.join()
+        assert not handler.get_in_progress_names(collection.name)
+
+    async def test_stop_registers_queued_objects(self, db, minio, collection):
+        registrar = handler.get_registrar()
+        registrar.start(asyncio.get_running_loop())
+        paths = [write(collection / f"file{i}.txt", f"data {i}") for i in range(5)]
+        for path in paths:
+            await handler.handle_file_created_or_modified(path)
+
+        await registrar.stop()
+
+        for path in paths:
+            assert await ready_object(collection, path.name) is not None
+        with pytest.raises(RuntimeError):
+            await registrar.put({})
+
+    async def test_file_deleted_before_registration_is_not_registered(
+        self, registrar, minio, collection
+    ):
+        path = write(collection / "file.txt", "data")
+        await handler.handle_file_created_or_modified(path)
+
+        # The registrar task has not run yet: the row is still queued
+        path.unlink()
+        await registrar.join()
+
+        assert await ready_object(collection, "file.txt") is None
+        assert minio.deletes == [f"{collection.name}/file.txt"]
+
+
+class TestUnchangedFileSkip:
+    @pytest.fixture
+    def hashes(self, monkeypatch) -> list[Path]:
+        """Record the files hashed by the watcher outside of uploads."""
+        hashed = []
+        compute = handler.compute_file_hash
+
+        def recording_compute(file_path):
+            hashed.append(file_path)
+            return compute(file_path)
+
+        monkeypatch.setattr(handler, "compute_file_hash", recording_compute)
+        return hashed
+
+    async def test_remembered_file_is_not_hashed_or_uploaded(
+        self, registrar, minio, hashes, collection
+    ):
+        # Old enough for its mtime to be trusted
+        path = write(collection / "file.txt", "data", age=60)
+        await handler.handle_file_created_or_modified(path)
+        await registrar.join()
+
+        await handler.handle_file_created_or_modified(path)
+
+        assert len(minio.uploads) == 1
+        assert hashes == []
+
+    async def test_racy_mtime_is_not_remembered(self, registrar, minio, collection):
+        path = write(collection / "file.txt", "data")
+        await handler.handle_file_created_or_modified(path)
+        await registrar.join()
+
+        assert (collection.name, "file.txt") not in handler._hash_cache
+
+    async def test_unremembered_file_is_hashed_not_uploaded(
+        self, registrar, minio, hashes, collection
+    ):
+        path = write(collection / "file.txt", "data", age=60)
+        await handler.handle_file_created_or_modified(path)
+        await registrar.join()
+        # As after a restart
+        handler._hash_cache.clear()
+
+        await handler.handle_file_created_or_modified(path)
+
+        assert len(minio.uploads) == 1
+        assert hashes == [path]
+
+    async def test_changed_file_is_uploaded(self, registrar, minio, collection):
+        path = write(collection / "file.txt", "data", age=60)
+        await handler.handle_file_created_or_modified(path)
+        await registrar.join()
+
+        # Same size, new content and mtime
+        write(path, "DATA", age=30)
+        await handler.handle_file_created_or_modified(path)
+        await registrar.join()
+
+        assert len(minio.uploads) == 2
+        obj = await ready_object(collection, "file.txt")
+        assert obj.hash_sha256 == handler.compute_file_hash(path)[0]
+
+
+@pytest.fixture
+def quiescence(monkeypatch) -> float:
+    """Shorten the quiet period so tests settle quickly."""
+    monkeypatch.setattr(handler, "QUIESCENCE_SECONDS", 0.02)
+    return 0.02
+
+
+class RecordingHandlers:
+    """Stand-ins for the file handlers, recording which one ran for which path."""
+
+    def __init__(self, monkeypatch):
+        self.calls: list[tuple[str, str]] = []
+        monkeypatch.setattr(handler, "handle_file_created_or_modified", self.created)
+        monkeypatch.setattr(handler, "handle_file_deleted", self.deleted)
+
+    async def created(self, file_path: Path) -> bool:
+        self.calls.append(("created", file_path.name))
+        return True
+
+    async def deleted(self, file_path: Path) -> bool:
+        self.calls.append(("deleted", file_path.name))
+        return True
+
+
+class TestEventCoalescing:
+    async def test_event_burst_is_handled_once(self, monkeypatch, quiescence, collection):
+        handlers = RecordingHandlers(monkeypatch)
+        event_handler = VaultEventHandler(asyncio.get_running_loop())
+        path = str(collection / "file.txt")
+
+        for _ in range(5):
+            event_handler._schedule(path)
+            await asyncio.sleep(quiescence / 4)
+        await asyncio.sleep(quiescence * 5)
+
+        assert handlers.calls == [("created", "file.txt")]
+
+    async def test_latest_event_decides(self, monkeypatch, quiescence, collection):
+        handlers = RecordingHandlers(monkeypatch)
+        event_handler = VaultEventHandler(asyncio.get_running_loop())
+        created = str(collection / "created.txt")
+        deleted = str(collection / "deleted.txt")
+
+        # Atomic save: the old file is removed and the new one renamed over it
+        event_handler._schedule(created, deleted=True)
+        event_handler._schedule(created)
+        event_handler._schedule(deleted)
+        event_handler._schedule(deleted, deleted=True)
+        await asyncio.sleep(quiescence * 5)
+
+        assert sorted(handlers.calls) == [("created", "created.txt"), ("deleted", "deleted.txt")]
+
+    async def test_paths_are_handled_separately(self, monkeypatch, quiescence, collection):
+        handlers = RecordingHandlers(monkeypatch)
+        event_handler = VaultEventHandler(asyncio.get_running_loop())
+
+        for i in range(3):
+            event_handler._schedule(str(collection / f"file{i}.txt"))
+        await asyncio.sleep(quiescence * 5)
+
+        assert sorted(handlers.calls) == [("created", f"file{i}.txt") for i in range(3)]
+
+    async def test_busy_path_is_retried(self, monkeypatch, quiescence, collection):
+        handlers = RecordingHandlers(monkeypatch)
+        results = iter([False, True])
+
+        async def busy_once(file_path: Path) -> bool:
+            handlers.calls.append(("created", file_path.name))
+            return next(results)
+
+        monkeypatch.setattr(handler, "handle_file_created_or_modified", busy_once)
+        event_handler = VaultEventHandler(asyncio.get_running_loop())
+
+        event_handler._schedule(str(collection / "file.txt"))
+        await asyncio.sleep(quiescence * 8)
+
+        assert handlers.calls == [("created", "file.txt")] * 2
+
+    async def test_save_while_processing_is_not_lost(
+        self, monkeypatch, quiescence, registrar, minio, collection
+    ):
+        uploading = threading.Event()
+        finish_upload = threading.Event()
+        upload = minio.upload_file
+
+        def slow_upload(object_key, file_path):
+            result = upload(object_key, file_path)
+            uploading.set()
+            finish_upload.wait(5)
+            return result
+
+        monkeypatch.setattr(handler, "upload_file", slow_upload)
+        event_handler = VaultEventHandler(asyncio.get_running_loop())
+        path = write(collection / "file.txt", "first")
+
+        event_handler._schedule(str(path))
+        await asyncio.to_thread(uploading.wait, 5)
+        # A second save while the first is still being uploaded
+        write(path, "second save")
+        event_handler._schedule(str(path))
+        await asyncio.sleep(quiescence * 5)
+        finish_upload.set()
+
+        for _ in range(100):
+            await asyncio.sleep(quiescence)
+            await registrar.join()
+            obj = await ready_object(collection, "file.txt")
+            if obj is not None and obj.size_bytes == len("second save"):
+                break
+        assert obj.hash_sha256 == handler.compute_file_hash(path)[0]
+        assert len(minio.uploads) == 2
+
+
+class TestNativeEventsProbe:
+    def test_unwritable_root_falls_back_to_polling(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(watcher, "_native_events_work", None)
+
+        assert watcher._native_events_work_in(tmp_path / "missing") is False